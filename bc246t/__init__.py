@@ -0,0 +1,64 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2013 Ryon Sherman <ryon.sherman@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+Serial protocol wrapper for the BC246T radio scanner. Importing the package
+does not import pyserial; it is only needed to open a port by name (See
+transport module). asyncio support is in bc246t.aio.
+
+Protocol and Documentation Copyright (c) 2008-2013 Uniden and its contributing authors.
+"""
+
+from .protocol import (SerialTimeoutException, DeviceErrorException, CommandUnavailableException,
+                       FramingErrorException, OverrunErrorException, Framer, Policy, Schema, TagTable, Future)
+from .device import Device, SharedDevice
+
+# the other modules are imported on first use, so processes needing only the
+# protocol (ex: response parsing workers) skip loading them
+_LAZY = {
+    'Hook': 'hooks', 'Histogram': 'hooks', 'PrometheusExporter': 'hooks', 'TraceLog': 'hooks',
+    'DevicePool': 'pool',
+    'Snapshot': 'snapshot',
+    'SystemTable': 'table',
+    'Sweep': 'sweep',
+    'Simulator': 'simulator',
+    'Recorder': 'trace', 'Replayer': 'trace',
+    'Benchmark': 'benchmark',
+    'ActivityLog': 'activity', 'ActivityLogger': 'activity',
+}
+
+__all__ = ['SerialTimeoutException', 'DeviceErrorException', 'CommandUnavailableException', 'FramingErrorException',
+           'OverrunErrorException', 'Framer', 'Policy', 'Schema', 'TagTable', 'Future', 'Device', 'SharedDevice'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    import importlib
+    value = getattr(importlib.import_module('.' + _LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,94 @@
+"""
+BC246T Command Line
+
+    python -m bc246t [options] command (arguments)
+"""
+
+import sys
+from optparse import OptionParser
+
+from . import Device, Benchmark, Simulator, Recorder, Replayer, TraceLog, PrometheusExporter, SerialTimeoutException
+
+
+def main():
+    parser = OptionParser(prog="bc246t", usage="Usage: %prog [options] command (arguments)\n       %prog [options] benchmark\n       %prog benchmark decode")
+    parser.add_option('-p', '--port', dest='port', metavar='PORT', default=0, help="a /dev/ttyUSB[PORT] number (default %default) or a device name")
+    parser.add_option('-b', '--baud', dest='baud', metavar='BAUDRATE', type='int', default=57600, help="set baud rate, default %default")
+    parser.add_option('-a', '--autodetect', dest='autodetect', action='store_true', help="probe for the scanner's baud rate instead of BAUDRATE")
+    parser.add_option('-t', '--timeout', dest='timeout', metavar='TIMEOUT', type='float', default=0.1, help="a read timeout value, default %default")
+    parser.add_option('-s', '--simulate', dest='simulate', metavar='SYSTEMS', type='int', help="use a simulated scanner holding SYSTEMS systems instead of PORT")
+    parser.add_option('-r', '--rounds', dest='rounds', metavar='ROUNDS', type='int', default=10, help="benchmark workload rounds, default %default")
+    parser.add_option('-o', '--output', dest='output', metavar='FILE', help="save benchmark results to a JSON baseline FILE")
+    parser.add_option('-c', '--compare', dest='compare', metavar='FILE', help="compare benchmark results to a JSON baseline FILE")
+    parser.add_option('--record', dest='record', metavar='FILE', help="record the serial session to a trace FILE")
+    parser.add_option('--replay', dest='replay', metavar='FILE', help="answer commands from a trace FILE instead of PORT")
+    parser.add_option('--speed', dest='speed', metavar='SPEED', type='float', default=1.0, help="trace replay speed (0: no delays), default %default")
+    parser.add_option('--trace', dest='trace', metavar='FILE', help="append a trace of each command to FILE")
+    parser.add_option('--metrics', dest='metrics', metavar='FILE', help="write Prometheus text format command metrics to FILE")
+    parser.add_option('--tolerance', dest='tolerance', metavar='FRACTION', type='float', default=0.1, help="allowed benchmark regression against baseline, default %default")
+    options, args = parser.parse_args()
+
+    def print_help():
+        parser.print_help()
+        sys.exit(-1)
+
+    if not len(args):
+        print_help()
+
+    if args == ['benchmark', 'decode']:
+        for opcode, result in sorted(Benchmark.decoding().items()):
+            print("%s: keys %.2fus, keys + int() %.2fus, schema %.2fus" % (opcode, result['keys'], result['keys_converted'], result['schema']))
+        sys.exit(0)
+
+    try:
+        options.port = '/dev/ttyUSB%d' % int(options.port)
+    except ValueError:
+        pass
+
+    if options.simulate is not None:
+        options.port = Simulator(port='simulator', baudrate=options.baud, timeout=options.timeout)
+        options.port.populate(options.simulate)
+    elif options.replay:
+        options.port = Replayer(options.replay, speed=options.speed, timeout=options.timeout)
+
+    try:
+        if options.autodetect:
+            dev = Device.autodetect(options.port, timeout=options.timeout)
+        else:
+            dev = Device(port=options.port, baudrate=options.baud, timeout=options.timeout)
+    except ImportError:
+        sys.exit("bc246t: pyserial is required to open %s" % options.port)
+    except OSError as error:
+        # serial.SerialException is an OSError
+        sys.exit("bc246t: %s" % error)
+    except SerialTimeoutException:
+        sys.exit("bc246t: no response at %s baud" % "/".join(map(str, Device.BAUDRATES)))
+
+    if options.record:
+        dev.serial = Recorder(dev.serial, options.record)
+    if options.trace:
+        dev.hooks.append(TraceLog(options.trace))
+    if options.metrics:
+        dev.hooks.append(PrometheusExporter(options.metrics))
+
+    if args[0] == 'benchmark':
+        results = Benchmark(dev, rounds=options.rounds).run()
+        print(Benchmark.report(results))
+
+        if options.output:
+            Benchmark.save(results, options.output)
+        if options.compare:
+            regressions = Benchmark.compare(Benchmark.load(options.compare), results, options.tolerance)
+            if regressions:
+                sys.exit("Regressions against %s:\n  %s" % (options.compare, '\n  '.join(regressions)))
+    else:
+        print(dev.command(*args))
+
+    for hook in dev.hooks:
+        if isinstance(hook, PrometheusExporter):
+            hook.write()
+    dev.serial.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+BC246T Talkgroup Activity
+
+Logs each transmission heard by one or more scanners to a rotating,
+append-only binary store, queried by time range without reading it all.
+"""
+
+import os
+import glob
+import time
+import struct
+import threading
+
+from .device import Device
+from .protocol import SerialTimeoutException, Schema
+
+
+class ActivityLog(object):
+    """
+        Talkgroup Activity Log
+
+        Directory of append-only segment files, each named by the end time of
+        its first transmission ([PREFIX]-[MILLISECONDS].log). Transmissions are
+        appended as they end (as ActivityLogger does), so a segment only holds
+        transmissions ending before the next segment's time. A segment is
+        rotated once it holds `segment_size` bytes or is `segment_age` seconds
+        old; with `keep` only the newest segments are kept. Rows are buffered
+        in memory until `block` rows or `flush_interval` seconds, then written
+        as one block:
+
+            [MAGIC][VERSION][BLOCK]...
+
+                [MAGIC]         : "BC246TAL"
+                [VERSION]       : Format Version (1 byte)
+                [BLOCK]         : [HEADER][STRINGS][COLUMNS]
+                [HEADER]        : [ROWS] (4 bytes), [FIRST] (8 byte double), [LAST] (8 byte double),
+                                  [STRINGS SIZE] (4 bytes), [COLUMNS SIZE] (4 bytes), little endian
+                [FIRST]/[LAST]  : Earliest start and latest end time of the block's rows
+                [STRINGS]       : [COUNT] (2 bytes), then each string's [LENGTH] (1 byte) and characters
+                [COLUMNS]       : Each COLUMN's ROWS values
+
+        Block headers are the time index: queries seek past blocks outside their
+        time range, and past blocks whose strings lack the TGID looked for.
+        Strings read back are Device.TAGS copies.
+
+            log = ActivityLog('/var/lib/bc246t')
+            for row in log.query(start=monday, end=tuesday, tgid='01-123'):
+                print(row['start'], row['name3'])
+
+    """
+
+    MAGIC = b'BC246TAL'
+    VERSION = 1
+    HEADER = '<IddII'
+
+    # column: struct typecode ('H': index of the block's strings)
+    COLUMNS = (
+        ('start', 'd'),
+        ('end', 'd'),
+        ('radio', 'H'),
+        ('sys_type', 'H'),
+        ('tgid', 'H'),
+        ('name1', 'H'),
+        ('name2', 'H'),
+        ('name3', 'H'),
+    )
+    STRINGS = ('sys_type', 'tgid', 'name1', 'name2', 'name3')
+
+    BLOCK = 1024
+    SEGMENT_SIZE = 64 * 1024 * 1024
+    SEGMENT_AGE = 24 * 60 * 60
+
+    def __init__(self, directory, prefix='activity', block=BLOCK, flush_interval=60.0,
+                 segment_size=SEGMENT_SIZE, segment_age=SEGMENT_AGE, keep=None):
+        """ Initialize ActivityLog """
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.directory = directory
+        self.prefix = prefix
+        self.block = block
+        self.flush_interval = flush_interval
+        self.segment_size = segment_size
+        self.segment_age = segment_age
+        self.keep = keep
+
+        self.f = None
+        self.rows = []
+        self._opened = self._buffered = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def segments(self):
+        """ Get (time, path) of each segment, oldest first """
+
+        segments = []
+        for path in glob.glob(os.path.join(self.directory, '%s-*.log' % self.prefix)):
+            try:
+                segments.append((int(os.path.basename(path)[len(self.prefix) + 1:-4]) / 1000.0, path))
+            except ValueError:
+                pass
+        return sorted(segments)
+
+    def append(self, start, end, radio=0, sys_type='', tgid='', name1='', name2='', name3=''):
+        """ Log one transmission """
+
+        with self._lock:
+            if not self.rows:
+                self._buffered = time.time()
+            self.rows.append((start, end, radio, sys_type, tgid, name1, name2, name3))
+            if len(self.rows) >= self.block or time.time() - self._buffered >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        """ Write buffered rows """
+
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self.f:
+                self.f.close()
+                self.f = None
+
+    def _flush(self):
+        if not self.rows:
+            return
+
+        rows, self.rows = self.rows, []
+        if self.f is None or self.f.tell() >= self.segment_size or time.time() - self._opened >= self.segment_age:
+            self._rotate(min(row[1] for row in rows))
+
+        strings, index = [], {}
+        columns = b''
+        for position, (column, typecode) in enumerate(self.COLUMNS):
+            values = [row[position] for row in rows]
+            if column in self.STRINGS:
+                for i, value in enumerate(values):
+                    if value not in index:
+                        index[value] = len(strings)
+                        strings.append(value)
+                    values[i] = index[value]
+            columns += struct.pack('<%d%s' % (len(rows), typecode), *values)
+
+        data = struct.pack('<H', len(strings))
+        for value in strings:
+            value = value.encode('latin-1')[:255]
+            data += struct.pack('<B', len(value)) + value
+
+        header = struct.pack(self.HEADER, len(rows), min(row[0] for row in rows), max(row[1] for row in rows), len(data), len(columns))
+        self.f.write(header + data + columns)
+        self.f.flush()
+
+    def _rotate(self, first):
+        if self.f:
+            self.f.close()
+
+        self._opened = time.time()
+        path = os.path.join(self.directory, '%s-%013d.log' % (self.prefix, int(first * 1000)))
+        self.f = open(path, 'ab')
+        if not self.f.tell():
+            self.f.write(self.MAGIC + struct.pack('<B', self.VERSION))
+
+        if self.keep:
+            for first, old in self.segments[:-self.keep]:
+                os.remove(old)
+
+    def query(self, start=None, end=None, **criteria):
+        """
+            Yield logged transmissions overlapping start..end (seconds since the
+            epoch, None for unbounded) whose columns equal every given value
+            (ex: tgid='01-123', radio=2), as dicts in logged order.
+
+            NOTE: Rows still buffered in memory are not included (See flush).
+
+        """
+
+        segments = self.segments
+        for i, (first, path) in enumerate(segments):
+            if start is not None and i + 1 < len(segments) and segments[i + 1][0] < start:
+                continue
+            for row in self.read(path, start, end, **criteria):
+                yield row
+
+    @classmethod
+    def read(cls, path, start=None, end=None, **criteria):
+        """ Yield matching transmissions of one segment (See query) """
+
+        header_size = struct.calcsize(cls.HEADER)
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC) + 1)[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError("%s: not an activity log" % path)
+
+            while True:
+                header = f.read(header_size)
+                # a segment cut short (ex: by a crash) ends at its last complete block
+                if len(header) < header_size:
+                    return
+                rows, first, last, strings_size, columns_size = struct.unpack(cls.HEADER, header)
+                if (start is not None and last < start) or (end is not None and first > end):
+                    f.seek(strings_size + columns_size, os.SEEK_CUR)
+                    continue
+
+                data = f.read(strings_size)
+                strings, offset = [], 2
+                for i in range(struct.unpack_from('<H', data)[0]):
+                    length = struct.unpack_from('<B', data, offset)[0]
+                    strings.append(Device.TAGS.intern(data[offset + 1:offset + 1 + length].decode('latin-1')))
+                    offset += 1 + length
+
+                wanted = dict(criteria)
+                for column in cls.STRINGS:
+                    if column in wanted:
+                        if wanted[column] not in strings:
+                            break
+                        wanted[column] = strings.index(wanted[column])
+                else:
+                    data = f.read(columns_size)
+                    if len(data) < columns_size:
+                        return
+                    for row in cls._rows(data, rows, strings, start, end, wanted):
+                        yield row
+                    continue
+
+                f.seek(columns_size, os.SEEK_CUR)
+
+    @classmethod
+    def _rows(cls, data, rows, strings, start, end, wanted):
+        columns, offset = {}, 0
+        for column, typecode in cls.COLUMNS:
+            columns[column] = struct.unpack_from('<%d%s' % (rows, typecode), data, offset)
+            offset += struct.calcsize('<%d%s' % (rows, typecode))
+
+        for row in range(rows):
+            if (start is not None and columns['end'][row] < start) or (end is not None and columns['start'][row] > end):
+                continue
+            if any(columns[column][row] != value for column, value in wanted.items()):
+                continue
+
+            yield dict((column, strings[columns[column][row]] if column in cls.STRINGS else columns[column][row]) for column, typecode in cls.COLUMNS)
+
+
+class ActivityLogger(object):
+    """
+        Talkgroup Activity Logger
+
+        Polls squelch (STS) and, while it is open, the talkgroup (GID) of a
+        Device, logging each transmission to an ActivityLog when squelch
+        closes or the talkgroup changes. Poll periods are as in
+        Device.watch_status. Several loggers (one per radio) may share a log:
+
+            log = ActivityLog('/var/lib/bc246t')
+            for radio, dev in enumerate(pool.devices):
+                threading.Thread(target=ActivityLogger(dev, log, radio).run, args=(stop,)).start()
+
+    """
+
+    FIELDS = ('sys_type', 'tgid', 'name1', 'name2', 'name3')
+
+    def __init__(self, device, log, radio=0, interval=0.25, minimum=0.05, maximum=2.0):
+        """ Initialize ActivityLogger """
+
+        self.device = device
+        self.log = log
+        self.radio = radio
+        self.interval = interval
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def run(self, stop=None):
+        """ Log until the stop Event is set (or forever) """
+
+        device = self.device
+        current = None
+        period = self.interval
+
+        try:
+            while stop is None or not stop.is_set():
+                polled = time.time()
+                try:
+                    opened = device.command('STS', schema=Schema.squelch) == Device.SQUELCH.OPEN
+                    if opened:
+                        talkgroup = device.talkgroup
+                        talkgroup = tuple(str(talkgroup[field]) for field in self.FIELDS)
+                except SerialTimeoutException:
+                    # keep the transmission in progress until the scanner answers again
+                    opened = current is not None
+                    talkgroup = current[1] if current else None
+
+                if current and (not opened or talkgroup != current[1]):
+                    self.log.append(current[0], polled, self.radio, *current[1])
+                    current = None
+                if opened:
+                    if current is None:
+                        current = (polled, talkgroup)
+                    period = self.minimum
+                else:
+                    period = self.interval if period < self.interval else min(period * 2, self.maximum)
+
+                time.sleep(max(polled + period - time.time(), 0))
+        finally:
+            if current:
+                self.log.append(current[0], time.time(), self.radio, *current[1])
@@ -0,0 +1,294 @@
+"""
+BC246T asyncio Device
+
+Non-blocking counterpart of Device: one event loop may poll many
+scanners without a thread per device. The serial port is opened directly
+as a raw, non-blocking tty, so it may also be a pty served by
+Simulator.pty():
+
+    sim = Simulator()
+    dev = AsyncDevice(sim.pty())
+    print(await dev.model)
+
+Properties return coroutines (await dev.status); setters are coroutine
+methods (await dev.settings.set_backlight(...)).
+
+Protocol and Documentation Copyright (c) 2008-2013 Uniden and its contributing authors.
+"""
+
+import os
+import errno
+import asyncio
+import termios
+
+from .device import Device
+from .protocol import SerialTimeoutException, Schema
+
+
+class AsyncDevice(object):
+    """ asyncio BC246T Device (See Device class) """
+
+    TOGGLE = Device.TOGGLE
+    LINE_DISPLAY_MODE = Device.LINE_DISPLAY_MODE
+    ICON_DISPLAY_MODE = Device.ICON_DISPLAY_MODE
+    KEY_CODE = Device.KEY_CODE
+    KEY_MODE = Device.KEY_MODE
+    MODULATION = Device.MODULATION
+    ID_SEARCH_MODE = Device.ID_SEARCH_MODE
+    SQUELCH = Device.SQUELCH
+    ALERT_STATUS = Device.ALERT_STATUS
+
+    BAUDRATES = {
+        9600: termios.B9600,
+        19200: termios.B19200,
+        38400: termios.B38400,
+        57600: termios.B57600,
+    }
+
+    def __init__(self, port, baudrate=57600, timeout=0.1):
+        """ Initialize AsyncDevice """
+
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.fd = self._open(port, baudrate)
+        self.settings = self.Settings(self)
+        self.systems = self.Systems(self)
+
+        self._program = False
+        self._buffer = b''
+        self._waiter = None
+        self._opcode = None
+        self._loop = None
+        self._lock = None
+
+    def _open(self, port, baudrate):
+        """ Open port as a raw, non-blocking tty """
+
+        fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            iflag, oflag, cflag, lflag, ispeed, ospeed, cc = termios.tcgetattr(fd)
+            iflag = 0
+            oflag = 0
+            lflag = 0
+            cflag = (cflag & ~(termios.CSIZE | termios.PARENB | termios.CSTOPB)) | termios.CS8 | termios.CREAD | termios.CLOCAL
+            ispeed = ospeed = self.BAUDRATES[baudrate]
+            termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, ispeed, ospeed, cc])
+        except Exception:
+            os.close(fd)
+            raise
+
+        return fd
+
+    def close(self):
+        """ Close port """
+
+        if self._loop:
+            self._loop.remove_reader(self.fd)
+        os.close(self.fd)
+
+    def _attach(self):
+        """ Start reading responses on the running event loop """
+
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+            self._lock = asyncio.Lock()
+            self._loop.add_reader(self.fd, self._read)
+
+    def _read(self):
+        """ Collect response lines, handing each to the waiting command """
+
+        try:
+            self._buffer += os.read(self.fd, 1024)
+        except OSError as error:
+            if error.errno != errno.EAGAIN:
+                raise
+            return
+
+        while b'\r' in self._buffer:
+            line, self._buffer = self._buffer.split(b'\r', 1)
+            line = line.decode('latin-1')
+            # other lines are late responses of timed out commands (as in Device._exchange)
+            if self._waiter and not self._waiter.done() and (line.startswith(self._opcode) or line.strip() in ('ERR', 'FER', 'ORER')):
+                self._waiter.set_result(line)
+
+    async def _write(self, data):
+        while data:
+            try:
+                data = data[os.write(self.fd, data):]
+            except OSError as error:
+                if error.errno != errno.EAGAIN:
+                    raise
+                await asyncio.sleep(0)
+
+    async def command(self, command, *args, keys=None, schema=None, intern=None, timeout=None):
+        """ Execute Raw Command (See Device.command) """
+
+        self._attach()
+        async with self._lock:
+            self._waiter = self._loop.create_future()
+            self._opcode = command
+            await self._write(Device.frame(command, *args))
+            try:
+                response = await asyncio.wait_for(self._waiter, self.timeout if timeout is None else timeout)
+            except asyncio.TimeoutError:
+                raise SerialTimeoutException
+            finally:
+                self._waiter = self._opcode = None
+
+        return Device.decode(response, keys, schema, intern)
+
+    @property
+    def model(self):
+        """ Get Model Info (See Device.model) """
+
+        return self.command('MDL')
+
+    @property
+    async def firmware(self):
+        """ Get Firmware Version (See Device.firmware) """
+
+        return (await self.command('VER'))[2:]
+
+    @property
+    def program(self):
+        """ Get Program Mode """
+
+        return self._program
+
+    async def set_program(self, mode):
+        """ Set Program Mode (See Device.program) """
+
+        self._program = mode if await self.command('PRG' if mode else 'EPG') == 'OK' else False
+
+    @property
+    def status(self):
+        """ Get Current Status (See Device.status) """
+
+        return self.command('STS', schema=Schema.status)
+
+    @property
+    def talkgroup(self):
+        """ Get Current Talkgroup ID Status (See Device.talkgroup) """
+
+        return self.command('GID', keys=('sys_type', 'tgid', 'id_srch_mode', 'name1', 'name2', 'name3'), intern=('name1', 'name2', 'name3'))
+
+    def key(self, key_code, key_mode=Device.KEY_MODE.PRESS):
+        """ Push KEY (See Device.key) """
+
+        return self.command('KEY', key_code, key_mode)
+
+    def quick_search(self, frq, stp=0, mod=Device.MODULATION.AUTO, att=0, dly=0, skp=0, code_srch=0, scr='00000000', rep=0):
+        """ Go to quick search hold mode (See Device.quick_search) """
+
+        return self.command('QSH', frq, stp, mod, att, dly, skp, code_srch, scr, rep)
+
+    def poweroff(self):
+        """ Power OFF (See Device.poweroff) """
+
+        return self.command('POF')
+
+
+    class Settings(object):
+        """ Device Settings (See Device.Settings class) """
+
+        BACKLIGHT = Device.Settings.BACKLIGHT
+
+        def __init__(self, device):
+            """ Initialize Settings """
+
+            self.device = device
+
+        def clear(self):
+            """ Clear All Memory (See Device.Settings.clear) """
+
+            return self.device.command('CLR', timeout=10)
+
+        @property
+        def backlight(self):
+            return self.device.command('BLT')
+
+        def set_backlight(self, value):
+            return self.device.command('BLT', value)
+
+        @property
+        async def battery_save(self):
+            return int(await self.device.command('BSV'))
+
+        def set_battery_save(self, value):
+            return self.device.command('BSV', value)
+
+        @property
+        async def key_beep(self):
+            return int(await self.device.command('KBP'))
+
+        def set_key_beep(self, value):
+            return self.device.command('KBP', value)
+
+        @property
+        def opening_message(self):
+            return self.device.command('OMS', keys=('l1_char', 'l2_char'))
+
+        def set_opening_message(self, message):
+            l1_char, l2_char = message
+            return self.device.command('OMS', l1_char, l2_char)
+
+        @property
+        async def priority_mode(self):
+            return int(await self.device.command('PRI'))
+
+        def set_priority_mode(self, value):
+            return self.device.command('PRI', value)
+
+
+    class Systems(object):
+        """ Device Systems (See Device.Systems class) """
+
+        def __init__(self, device):
+            """ Initialize Systems """
+
+            self.device = device
+
+        async def __aiter__(self):
+            """ Iterate system info dicts (with their index) in list order (head to tail by FWD_INDEX) """
+
+            index, last = await self.head, await self.tail
+            while index != -1:
+                info = await self.info(index)
+                info['index'] = index
+                yield info
+                if index == last:
+                    return
+                index = int(info['fwd_index'])
+
+        async def count(self):
+            return int(await self.device.command('SCT'))
+
+        @property
+        async def head(self):
+            return int(await self.device.command('SIH'))
+
+        @property
+        async def tail(self):
+            return int(await self.device.command('SIT'))
+
+        async def append(self, sys_type):
+            """ Create System, returning its index """
+
+            return int(await self.device.command('CSY', sys_type))
+
+        def remove(self, index):
+            return self.device.command('DSY', index)
+
+        def info(self, index):
+            return self.device.command('SIN', index, keys=('sys_type', 'name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg', 'rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail', 'seq_no'), intern=('name',))
+
+        @property
+        def system_quick_lockout(self):
+            return self.device.command('QSL')
+
+        def set_system_quick_lockout(self, value):
+            return self.device.command('QSL', value)
+
+        def group_quick_lockout(self, index, value=None):
+            return self.device.command('QGL', index, value)
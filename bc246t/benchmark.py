@@ -0,0 +1,228 @@
+"""
+BC246T Benchmark
+"""
+
+import json
+import time
+
+from .device import Device
+from .hooks import Histogram
+from .protocol import SerialTimeoutException, DeviceErrorException, CommandUnavailableException, FramingErrorException, OverrunErrorException, Schema
+from .simulator import Simulator
+
+
+class Benchmark(object):
+    """
+        Device Benchmark
+
+        Runs a mixed workload against a Device and reports commands/sec, bytes
+        on the wire and latency percentiles per opcode, measured with a
+        Histogram hook.
+
+        Each round
+            1: STS polling (`polls` times)
+            2: GID polling (`polls` times)
+            3: Full Systems iteration (Program Mode)
+            4: Settings reads, then writes of the values read (Program Mode)
+
+        Results are plain dicts which may be saved as JSON baselines and
+        compared between runs with compare().
+
+    """
+
+    VERSION = 1
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, device, rounds=10, polls=20):
+        """ Initialize Benchmark """
+
+        self.device = device
+        self.rounds = rounds
+        self.polls = polls
+
+    def run(self):
+        """ Run workload, returning results """
+
+        device = self.device
+        histogram = Histogram(samples=True)
+        device.hooks.append(histogram)
+        start = time.time()
+        try:
+            for i in range(self.rounds):
+                for step in (self._poll_status, self._poll_talkgroup, self._systems, self._settings):
+                    try:
+                        step()
+                    except (SerialTimeoutException, DeviceErrorException, CommandUnavailableException,
+                            FramingErrorException, OverrunErrorException):
+                        pass
+        finally:
+            elapsed = time.time() - start
+            if device.program:
+                device.program = False
+            device.hooks.remove(histogram)
+
+        opcodes = histogram.opcodes
+        commands = sum(stats['count'] for stats in opcodes.values())
+        return {
+            'version': self.VERSION,
+            'port': str(device.port),
+            'baudrate': int(device.baudrate),
+            'timeout': float(device.timeout),
+            'rounds': self.rounds,
+            'polls': self.polls,
+            'elapsed': elapsed,
+            'commands': commands,
+            'commands_per_sec': commands / elapsed if elapsed else 0.0,
+            'bytes_written': sum(stats['written'] for stats in opcodes.values()),
+            'bytes_read': sum(stats['read'] for stats in opcodes.values()),
+            'opcodes': dict((opcode, self._summary(samples, sum(opcodes[opcode]['errors'].values()))) for opcode, samples in histogram.samples.items()),
+        }
+
+    def _poll_status(self):
+        for i in range(self.polls):
+            self.device.status
+
+    def _poll_talkgroup(self):
+        for i in range(self.polls):
+            self.device.talkgroup
+
+    def _systems(self):
+        self.device.program = True
+        for system in self.device.systems:
+            system.name
+
+    def _settings(self):
+        settings = self.device.settings
+        self.device.program = True
+
+        values = dict((name, getattr(settings, name)) for name in ('backlight', 'battery_save', 'key_beep', 'priority_mode'))
+        opening_message = settings.opening_message
+
+        for name, value in values.items():
+            setattr(settings, name, value)
+        settings.opening_message = (opening_message['l1_char'], opening_message['l2_char'])
+
+        self.device.program = False
+
+    def _summary(self, samples, errors=0):
+        samples = sorted(samples)
+        summary = {
+            'count': len(samples),
+            'errors': errors,
+            'mean': sum(samples) / len(samples),
+            'max': samples[-1],
+        }
+        for percentile in self.PERCENTILES:
+            rank = max(int(round(percentile / 100.0 * len(samples))) - 1, 0)
+            summary['p%d' % percentile] = samples[rank]
+
+        return summary
+
+    @staticmethod
+    def decoding(iterations=100000):
+        """
+            Compare response decoding paths
+
+            Returns microseconds per response for each opcode decoded to strings
+            with keys (dict(zip(...))), the same followed by int conversion of
+            numeric fields, and to typed values with its Schema decoder.
+
+        """
+
+        simulator = Simulator(latency=False)
+        simulator.populate(1)
+        simulator.program = True
+        responses = {
+            'STS': ('STS', simulator.process('STS'), ('l1_char', 'l1_mode', 'l2_char', 'l2_mode', 'icon1', 'icon2', 'reserve', 'sql', 'mut', 'bat', 'wat')),
+            'GID': ('GID', 'GID,EDW,01-123,0,CITY,FIRE,DISPATCH', ('sys_type', 'tgid', 'id_srch_mode', 'name1', 'name2', 'name3')),
+            'SIN': ('SIN', simulator.process('SIN,1'), Device.System.INFO),
+        }
+
+        results = {}
+        for name, (opcode, response, keys) in sorted(responses.items()):
+            schema = Schema.decoder(opcode)
+            start = time.time()
+            for i in range(iterations):
+                Device.decode(response, keys)
+            keyed = time.time() - start
+
+            # what callers of the raw path do: convert each numeric field by hand
+            numeric = [key for key, kind in Schema.SCHEMAS[opcode] if kind == 'int']
+            start = time.time()
+            for i in range(iterations):
+                values = Device.decode(response, keys)
+                for key in numeric:
+                    values[key] = int(values[key]) if values[key] else None
+            converted = time.time() - start
+
+            start = time.time()
+            for i in range(iterations):
+                Device.decode(response, schema=schema)
+            typed = time.time() - start
+
+            results[name] = {
+                'keys': keyed / iterations * 1e6,
+                'keys_converted': converted / iterations * 1e6,
+                'schema': typed / iterations * 1e6,
+            }
+
+        return results
+
+    @staticmethod
+    def save(results, path):
+        """ Save results as a JSON baseline """
+
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def load(path):
+        """ Load a JSON baseline """
+
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def compare(baseline, results, tolerance=0.1):
+        """
+            Compare results against a baseline
+
+            Returns a list of regressions: commands/sec falling, or p50/p99 latency
+            of an opcode rising, by more than `tolerance` (fraction of baseline).
+
+        """
+
+        if baseline.get('version') != results.get('version'):
+            return ["baseline version %s does not match %s" % (baseline.get('version'), results.get('version'))]
+
+        regressions = []
+        if results['commands_per_sec'] < baseline['commands_per_sec'] * (1 - tolerance):
+            regressions.append("commands/sec: %.1f -> %.1f" % (baseline['commands_per_sec'], results['commands_per_sec']))
+
+        for opcode, before in sorted(baseline['opcodes'].items()):
+            after = results['opcodes'].get(opcode)
+            if not after:
+                continue
+            for key in ('p50', 'p99'):
+                if after[key] > before[key] * (1 + tolerance):
+                    regressions.append("%s %s: %.2fms -> %.2fms" % (opcode, key, before[key] * 1000, after[key] * 1000))
+
+        return regressions
+
+    @staticmethod
+    def report(results):
+        """ Format results as a text table """
+
+        lines = [
+            "%d commands in %.3fs: %.1f commands/sec, %d bytes written, %d bytes read" % (
+                results['commands'], results['elapsed'], results['commands_per_sec'],
+                results['bytes_written'], results['bytes_read']),
+            "",
+            "%-6s %7s %7s %9s %9s %9s %9s" % ('opcode', 'count', 'errors', 'mean ms', 'p50 ms', 'p90 ms', 'p99 ms'),
+        ]
+        for opcode, summary in sorted(results['opcodes'].items()):
+            lines.append("%-6s %7d %7d %9.2f %9.2f %9.2f %9.2f" % (
+                opcode, summary['count'], summary['errors'], summary['mean'] * 1000,
+                summary['p50'] * 1000, summary['p90'] * 1000, summary['p99'] * 1000))
+
+        return '\n'.join(lines)
@@ -0,0 +1,1893 @@
+"""
+BC246T Device
+
+Commands of the scanner's remote control protocol. A port name is opened
+with the serial transport (pyserial) on first use; serial-like objects (ex:
+Simulator, Replayer) are used as they are.
+
+Protocol and Documentation Copyright (c) 2008-2013 Uniden and its contributing authors.
+"""
+
+# TODO: Return constants (or array of) instead of (or along with) raw results.
+#   Ex: ['10', {'opt1': Device.const.true, 'opt2': Device.const.false}]
+# TODO: return constant instead of value, add __str__ to output value
+# TODO: Ensure values passed are constants or their values
+# TODO: Change string values to int wher epossible. Ex: '10' => 10
+
+import os
+import json
+import time
+import threading
+import itertools
+import contextlib
+import collections
+import queue
+
+from .protocol import SerialTimeoutException, DeviceErrorException, CommandUnavailableException, FramingErrorException, OverrunErrorException, Framer, Policy, Schema, TagTable, Future
+
+
+class Device(object):
+    """
+        BC246T Device
+
+        BPS rate        : 9600/19200/38400/57600 bps
+        Start/Stop bit  : 1 bit, 1 bit
+        Data Length     : 8 bit
+        Parity Check    : None
+        Code            : ASCII
+        Flow Control    : None
+        Return Code     : Carriage Return only
+
+    """
+
+    class TOGGLE:
+        OFF = 0
+        ON = 1
+
+    class LINE_DISPLAY_MODE:
+        NORMAL = ' '
+        REVERSE = '*'
+        CURSOR = '_'
+        BLINK = '#'
+
+    class ICON_DISPLAY_MODE:
+        OFF = '0'
+        ON = '1'
+        BLINK = '2'
+
+    # STS [ICON1]/[ICON2] positions
+    ICON1 = ('SYS', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', 'ATT', 'PRI', 'KEYLOCK', 'BATT')
+    ICON2 = ('GRP', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', 'AN', 'N', 'FM', 'LO', 'F', 'CC')
+
+    class KEY_CODE:
+        MENU = 'M'
+        F = 'F'
+        HOLD = 'H'
+        SCAN = 'S'
+        SEARCH = 'S'
+        L_O = 'L'
+        LIGHT = '!'
+        LOCK = '!'
+        ONE = '1'
+        PRI = '1'
+        TWO = '2'
+        WX = '2'
+        THREE = '3'
+        FOUR = '4'
+        FIVE = '5'
+        SIX = '6'
+        SEVEN = '7'
+        RCL = '7'
+        EIGHT = '8'
+        NINE = '9'
+        ZERO = '0'
+        DOT = '.'
+        NO = '.'
+        REV = '.'
+        E = 'E'
+        YES = 'E'
+        ATT = 'E'
+        VFO_RIGHT = '>'
+        VFO_LEFT = '<'
+        VFO_PUSH = '^'
+        POWER = 'P'
+
+    class KEY_MODE:
+        PRESS = 'P'
+        LONG_PRESS = 'L'
+        HOLD = 'H'
+        RELEASE = 'R'
+
+    class MODULATION:
+        AUTO = 'AUTO'
+        FM = 'FM'
+        NFM = 'NFM'
+        AM = 'AM'
+
+    class ID_SEARCH_MODE:
+        SCAN = 0
+        SEARCH = 1
+
+    class SQUELCH:
+        CLOSE = 0
+        OPEN = 1
+
+    class ALERT_STATUS:
+        NO_ALERT = 0
+        ALERT = 1
+
+    # alpha tags of decoded responses, shared by every Device (See TagTable class)
+    TAGS = TagTable()
+
+    def __init__(self, port, baudrate=57600, timeout=0.1, settings_ttl=None, typed=False, policy=None, hooks=None):
+        """ Initialize Device """
+
+        # decode responses to typed values (See Schema class)
+        self.typed = typed
+
+        # accept an already opened serial-like object (ex: Simulator) in place of a port name
+        if hasattr(port, 'readline'):
+            self.serial = port
+            self.port = getattr(port, 'port', None)
+            self.baudrate = getattr(port, 'baudrate', baudrate)
+            self.timeout = getattr(port, 'timeout', timeout)
+        else:
+            self.port = port
+            self.baudrate = baudrate
+            self.timeout = timeout
+            from . import transport
+            self.serial = transport.open(port, baudrate, timeout)
+
+        # per-opcode timeouts and retries (See Policy class)
+        self.policy = policy or Policy(self.timeout)
+        # instrumentation called around each command (See Hook class)
+        self.hooks = list(hooks or ())
+        self.settings = self.Settings(self, settings_ttl)
+        self.systems = self.Systems(self)
+
+    @property
+    def serial(self):
+        return self._serial
+
+    @serial.setter
+    def serial(self, serial):
+        """ Set serial port (or wrapper, ex: Recorder), framing its responses """
+
+        self._serial = serial
+        self.framer = Framer(serial)
+
+    BAUDRATES = (57600, 38400, 19200, 9600)
+    BAUDRATE_CACHE = os.path.join(os.path.expanduser('~'), '.bc246t_baudrates.json')
+
+    @classmethod
+    def autodetect(cls, port, timeout=0.1, probe_timeout=0.05, cache=BAUDRATE_CACHE, **kwargs):
+        """
+            Open Device at the scanner's baud rate
+
+            Probes BAUDRATES (fastest first) with MDL on one open port, trying the
+            rate cached for port first, and saves the working rate to `cache`
+            (None to disable). Raises SerialTimeoutException if none answers,
+            closing the port if it opened it.
+
+        """
+
+        rates = cls._cached_baudrates(cache)
+        port_name = port if not hasattr(port, 'readline') else getattr(port, 'port', None)
+        cached = rates.get(str(port_name))
+        candidates = ([cached] if cached in cls.BAUDRATES else []) + [rate for rate in cls.BAUDRATES if rate != cached]
+
+        if hasattr(port, 'readline'):
+            line = port
+        else:
+            from . import transport
+            line = transport.open(port, candidates[0], probe_timeout)
+        line.timeout = probe_timeout
+        # responses end with CR only, which serial readline() waits past
+        framer = Framer(line)
+        for rate in candidates:
+            if line.baudrate != rate:
+                line.baudrate = rate
+            line.flushInput()
+            framer.clear()
+            line.write(cls.frame('MDL'))
+            if framer.readline().startswith('MDL,'):
+                break
+        else:
+            if line is not port:
+                line.close()
+            raise SerialTimeoutException
+
+        line.timeout = timeout
+        if port_name is not None and cache and rate != cached:
+            rates[str(port_name)] = rate
+            cls._save_baudrates(cache, rates)
+
+        return cls(line, **kwargs)
+
+    @staticmethod
+    def _cached_baudrates(cache):
+        try:
+            with open(cache) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError, TypeError):
+            return {}
+
+    @staticmethod
+    def _save_baudrates(cache, rates):
+        temporary = '%s.%d' % (cache, os.getpid())
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(rates, f)
+            os.rename(temporary, cache)
+        except (IOError, OSError):
+            pass
+
+    def command(self, command, *args, **kwargs):
+        """ Execute Raw Command """
+
+        raw_command = self.frame(command, *args)
+        if self.typed and 'schema' not in kwargs:
+            kwargs['schema'] = Schema.decoder(command)
+
+        hooks = self.hooks
+        if hooks:
+            for hook in hooks:
+                hook.before(self, command, args)
+        begin = time.time()
+        written = read = 0
+
+        policy = self.policy
+        retries = policy.retries if policy.retryable(command) else 0
+        try:
+            while True:
+                start = time.time()
+                response = self._exchange(command, raw_command, policy.timeout(command))
+                written += len(raw_command)
+                read += len(response)
+
+                try:
+                    response = self.decode(response, **kwargs)
+                except Policy.RETRY as error:
+                    if isinstance(error, SerialTimeoutException):
+                        policy.backoff(command)
+                    if not retries:
+                        raise
+                    retries -= 1
+                    self._resync()
+                    continue
+
+                policy.observe(command, time.time() - start)
+                break
+        except Exception as error:
+            if hooks:
+                for hook in hooks:
+                    hook.after(self, command, args, written, read, time.time() - begin, error)
+            raise
+
+        if hooks:
+            for hook in hooks:
+                hook.after(self, command, args, written, read, time.time() - begin, None)
+        return response
+
+    def _exchange(self, command, raw_command, timeout):
+        """ Write a command frame, returning its response line ('' on timeout) """
+
+        serial = self._serial
+        if serial.timeout != timeout:
+            serial.timeout = timeout
+
+        serial.write(raw_command)
+        response = self.framer.readline()
+        # skip late responses to earlier (timed out) commands
+        while response and not response.startswith(command) and response.strip() not in ('ERR', 'FER', 'ORER'):
+            response = self.framer.readline()
+
+        return response
+
+    def _resync(self):
+        """ Drop late or garbled responses before resending """
+
+        self._serial.flushInput()
+        self.framer.clear()
+
+    @staticmethod
+    def encode(command, *args):
+        """ Encode Raw Command """
+
+        args = list(args)
+        # omitted trailing parameters are not sent, omitted inner ones are sent empty
+        while args and args[-1] is None:
+            args.pop()
+        args = ['' if arg is None else str(arg) for arg in args]
+        return "%s\r" % command if not args else "%s,%s\r" % (command, ','.join(args))
+
+    # precomputed frames of commands sent without parameters
+    FRAMES = dict((opcode, ("%s\r" % opcode).encode('latin-1')) for opcode in
+                  ('MDL', 'VER', 'PRG', 'EPG', 'POF', 'STS', 'GID', 'CLR', 'SCT', 'SIH', 'SIT', 'QSL', 'BLT', 'BSV', 'KBP', 'OMS', 'PRI'))
+
+    @classmethod
+    def frame(cls, command, *args):
+        """ Encode Raw Command to bytes """
+
+        if not args and command in cls.FRAMES:
+            return cls.FRAMES[command]
+
+        return cls.encode(command, *args).encode('latin-1')
+
+    @staticmethod
+    def decode(response, keys=None, schema=None, intern=None):
+        """
+            Decode Raw Response
+
+            With a Schema decoder, to typed values. Fields named in `intern` are
+            replaced by their TAGS copy.
+
+        """
+
+        response = response.strip()
+        if not response:
+            raise SerialTimeoutException
+        if response == "ERR" or response.endswith(",ERR"):
+            raise DeviceErrorException
+        if response == "NG" or response.endswith(",NG"):
+            raise CommandUnavailableException
+        if response == "FER":
+            raise FramingErrorException
+        if response == "ORER":
+            raise OverrunErrorException
+
+        if schema is not None:
+            response = response.partition(',')[2]
+            if response == 'OK':
+                return response
+            response = schema(response)
+        elif keys is not None:
+            response = dict(zip(keys, response.split(',')[1:]))
+        else:
+            response = response.split(',')[1:]
+            return response[0] if len(response) == 1 else response
+
+        if intern:
+            tags = Device.TAGS
+            for key in intern:
+                # short responses lack trailing fields
+                if key in response:
+                    response[key] = tags.intern(response[key])
+
+        return response
+
+    def pipeline(self, depth=4):
+        """ Get Pipeline (See Device.Pipeline class) """
+
+        return self.Pipeline(self, depth)
+
+    def batch(self, depth=8):
+        """ Get Batch (See Device.Batch class) """
+
+        return self.Batch(self, depth)
+
+    @property
+    def model(self):
+        """
+            Get Model Info
+
+            Returns Model Information.
+
+            Controller -> Radio
+                1: MDL
+
+            Radio -> Controller
+                1: MDL,BC246T
+
+        """
+
+        return self.command('MDL')
+
+    @property
+    def firmware(self):
+        """
+            Get Firmware Version
+
+            Returns Firmware Version.
+
+            Controller -> Radio
+                1: VER
+
+            Radio -> Controller
+                1: VER,VR1.00
+
+        """
+
+        return self.command('VER')[2:]
+
+    @property
+    def program(self):
+        """ Get Program Mode """
+
+        return getattr(self, '_program', False)
+
+    @program.setter
+    def program(self, mode):
+        """
+            Set Program Mode
+
+            NOTE: This property has been created in lieu of Enter/Exit Program Mode.
+                  The documentation for the two methods is as follows:
+
+            ----------------------------------------------------------------------
+
+            Enter Program Mode
+
+            The scanner goes to Program Mode.
+            The scanner displays "Remote Mode" on upper line and "Keypad Lock"
+                on lower line in Program Mode.
+            POWER key and Function key are valid in Program Mode.
+
+            Controller -> Radio
+                1: PRG
+
+            Radio -> Controller
+                1: PRG,OK
+                2: PRG,NG
+
+            NOTE: This command is invalid when the Scanner is in Menu Mode, during
+                  Direct Entry operation, and during Quick Save operation.
+
+            ----------------------------------------------------------------------
+
+            Exit Program Mode
+
+            The Scanner exits from Program Mode.
+            Then, the Scanner goes to Scan Hold Mode.
+
+            Controller -> Radio
+                1: EPG
+
+            Radio -> Controller
+                1: EPG,OK
+
+        """
+
+        self._program = mode if self.command('PRG' if mode else 'EPG') == 'OK' else False
+        if not mode:
+            self.settings.invalidate()
+
+    @property
+    def status(self):
+        """
+            Get Current Status
+
+            Returns current scanner status.
+
+            Controller -> Radio
+                1: STS
+
+            Radio -> Controller
+                1: STS,[L1_CHAR],[L1_MODE],[L2_CHAR],[L2_MODE],[ICON1],[ICON2],[RESERVE],[SQL],[MUT],[BAT],[WAT]
+
+                    [L1_CHAR]       : Line1 Characters 16char (fixed length)
+                    [L1_MODE]       : Line1 Display Mode 16char (See LINE_DISPLAY_MODE class)
+                    [L2_CHAR]       : Line2 Characters 16char (fixed length)
+                    [L2_MODE]       : Line2 Display Mode 16char (See LINE_DISPLAY_MODE class)
+                    [ICON1]         : Icon1 Group Display Mode 15char (See ICON_DISPLAY_MODE class, ICON1 positions)
+                                        SYS/1/2/3/4/5/6/7/8/9/0/ATT/PRI/KEYLOCK/BATT
+                    [ICON2]         : Icon2 Group Display Mode 17char (See ICON_DISPLAY_MODE class, ICON2 positions)
+                                        GRP/1/2/3/4/5/6/7/8/9/0/AN/N/FM/LO/F/CC
+                    [RESERVE]       : (Reserved area, not used)
+                    [SQL]           : Squelch Status (See SQUELCH class)
+                    [MUT]           : Mute Status (See TOGGLE class)
+                    [BAT]           : Battery Low Status (See ALERT_STATUS class)
+                    [WAT]           : Weather Alert Status (See ALERT_STATUS class, ???: NWR-SAME Code)
+
+            NOTE: Line1 or Line2 Characters may include "," as displayed character.
+                  Fields are decoded by their fixed widths (See Schema.status).
+
+        """
+
+        if self.typed:
+            return self.command('STS')
+
+        return self.command('STS', schema=Schema.status)
+
+    @property
+    def talkgroup(self):
+        """
+            Get Current Talkgroup ID Status
+
+            This command returns TGID currently displayed on LCD.
+
+            Controller -> Radio
+                1: GID
+
+            Radio -> Controller
+                1: GID,[SYS_TYPE],[TGID],[ID_SRCH_MODE],[NAME1],[NAME2],[NAME3]
+
+                    [SYS_TYPE]      : System Type
+                    [TGID]          : Talkgroup ID
+                    [ID_SRCH_MODE]  : ID Search Mode (See ID_SRCH_MODE class)
+                    [NAME1]         : SYSTEM NAME (Alpha Tag)
+                    [NAME2]         : GROUP NAME (Alpha Tag)
+                    [NAME3]         : TGID NAME (Alpha Tag)
+
+        """
+
+        return self.command('GID', keys=('sys_type', 'tgid', 'id_srch_mode', 'name1', 'name2', 'name3'), intern=('name1', 'name2', 'name3'))
+
+    def watch_status(self, interval=0.25, minimum=0.05, maximum=2.0):
+        """
+            Watch Status
+
+            Polls STS (and GID while squelch is open) and yields (EVENT, VALUE)
+            for each change, starting with the current state.
+
+                squelch         : [SQL] (See SQUELCH class)
+                mute            : [MUT] (See TOGGLE class)
+                battery         : [BAT] (See ALERT_STATUS class)
+                weather         : [WAT] (See ALERT_STATUS class)
+                talkgroup       : Talkgroup dict (See talkgroup property)
+
+            While squelch is open the scanner is polled every `minimum` seconds.
+            While closed the poll period starts at `interval` and doubles up to `maximum`.
+
+        """
+
+        events = (('sql', 'squelch'), ('mut', 'mute'), ('bat', 'battery'), ('wat', 'weather'))
+        state = {}
+        period = interval
+
+        while True:
+            polled = time.time()
+            status = self.status
+
+            for key, event in events:
+                if status[key] != state.get(event):
+                    state[event] = status[key]
+                    yield event, status[key]
+
+            # raw ('1') or typed (1) response, which may lack the field ('' or None)
+            if status['sql'] in (self.SQUELCH.OPEN, str(self.SQUELCH.OPEN)):
+                talkgroup = self.talkgroup
+                if talkgroup != state.get('talkgroup'):
+                    state['talkgroup'] = talkgroup
+                    yield 'talkgroup', talkgroup
+                period = minimum
+            else:
+                period = interval if period < interval else min(period * 2, maximum)
+
+            time.sleep(max(polled + period - time.time(), 0))
+
+    def key(self, key_code, key_mode=KEY_MODE.PRESS):
+        """
+            Push KEY
+
+            Controller -> Radio
+                1: KEY,[KEY_CODE],[KEY_MODE]
+
+                    [KEY_CODE]      : Key Code (See KEY_CODE class)
+                    [KEY_MODE]      : Key Mode (See KEY_MODE class)
+
+            Radio -> Controller
+                1: KEY,OK
+
+            NOTE: The scanner is not turned off by this command.
+
+        """
+
+        return self.command('KEY', key_code, key_mode)
+
+    def quick_search(self, frq, stp=0, mod=MODULATION.AUTO, att=0, dly=0, skp=0, code_srch=0, scr='00000000', rep=0):
+        """
+            Go to quick search hold mode
+
+            Specifies arbitrary frequency and changes to Quick Search Hold (VFO) mode.
+
+            Controller -> Radio
+                1: QSH,[FRQ],[STP],[MOD],[ATT],[DLY],[SKP],[CODE_SRCH],[SCR],[REP]
+
+                    [FRQ]           : Frequency
+                    [STP]           : Search Step (0,500,625,750, ... 5000,10000,20000)
+                                        0: AUTO
+                                        500: 5k
+                                        625: 6.25k
+                                        750: 7.5k
+                                        1000: 10k
+                                        1250: 12.5k
+                                        1500: 15k
+                                        20000: 20k
+                                        25000: 25k
+                                        50000: 50k
+                                        10000: 100k
+                    [MOD]           : Modulation (See MODULATION class)
+                    [ATT]           : Attenuation (See TOGGLE class)
+                    [DLY]           : Delay Time (0-5)
+                    [SKP]           : Data Skip (See TOGGLE class)
+                    [CODE_SRCH]     : CTCSS/DCS Search (See TOGGLE class)
+                    [SCR]           : Pager/UHF TV Screen (See TOGGLE class)
+                                        (8digit: ########) (See TOGGLE class)
+                                                 |||||||+- Reserved (always 0)
+                                                 ||||||+-- Reserved (always 0)
+                                                 |||||+--- Reserved (always 0)
+                                                 ||||+---- Reserved (always 0)
+                                                 |||+----- Reserved (always 0)
+                                                 ||+------ Reserved (always 0)
+                                                 |+------- UHF TV
+                                                 +-------- Pager
+                    [REP]           : Repeater Find (See TOGGLE class)
+
+            Radio -> Controller
+                1: QSH,OK
+                2: QSH,NG
+
+            NOTE: This command is invalid when the Scanner is in Menu Mode, during
+                  Direct Entry operation, and during Quick Save operation.
+
+        """
+
+        return self.command('QSH', frq, stp, mod, att, dly, skp, code_srch, scr, rep)
+
+    def poweroff(self):
+        """
+            Power OFF
+
+            Turns off the scanner.
+
+            Controller -> Radio
+                1: POF
+
+            Radio -> Controller
+                1: POF,OK
+
+            NOTE: After this command, the scanner doesn't accept any command.
+
+        """
+        return self.command('POF')
+
+    @contextlib.contextmanager
+    def programming(self):
+        """ Hold Program Mode for the duration of a with block, leaving it only if entered here """
+
+        program = self.program
+        if not program:
+            self.program = True
+        try:
+            yield self
+        finally:
+            if not program:
+                self.program = False
+
+    def snapshot(self, path):
+        """
+            Save Scanner Programming
+
+            Streams settings, System Quick Lockout and every system (SIN fields,
+            Group Quick Lockout and list pointers) to a Snapshot file.
+
+            NOTE: The scanner is held in Program Mode while reading.
+
+        """
+
+        from .snapshot import Snapshot
+
+        with open(path, 'wb') as f:
+            with self.programming():
+                Snapshot.write(f, Snapshot.read(self))
+
+    def restore(self, path):
+        """
+            Restore Scanner Programming
+
+            Compares a Snapshot file with the scanner and sends only the commands
+            needed to match it. Returns the list of commands sent.
+
+            NOTE: List pointers are assigned by the scanner. Systems are matched in
+                  list order and recreated from the first system type mismatch,
+                  so the restored list order follows the snapshot.
+
+        """
+
+        from .snapshot import Snapshot
+
+        settings, qsl, systems = Snapshot.state(Snapshot.load(path))
+        sent = []
+
+        def send(command, *args):
+            sent.append((command,) + args)
+            return self.command(command, *args)
+
+        with self.programming():
+            current_settings, current_qsl, current_systems = Snapshot.state(Snapshot.read(self))
+
+            for key in ('BLT', 'BSV', 'KBP', 'PRI'):
+                if settings[key] != current_settings[key]:
+                    send(key, settings[key])
+            if (settings['l1_char'], settings['l2_char']) != (current_settings['l1_char'], current_settings['l2_char']):
+                send('OMS', settings['l1_char'], settings['l2_char'])
+
+            # keep matching systems in list order, recreate from the first mismatch
+            kept = 0
+            for current, target in zip(current_systems, systems):
+                if current['sys_type'] != target['sys_type']:
+                    break
+                kept += 1
+            for current in current_systems[kept:]:
+                send('DSY', current['index'])
+
+            for position, target in enumerate(systems):
+                if position < kept:
+                    current = current_systems[position]
+                else:
+                    index = send('CSY', target['sys_type'])
+                    current = dict(self.systems._raw_info(index), qgl=self.command('QGL', index, schema=None))
+
+                changes = [target[key] if target[key] not in ('', current[key]) else None for key in Snapshot.SIN]
+                if [value for value in changes if value is not None]:
+                    send('SIN', current['index'], *changes)
+                if target['qgl'] and target['qgl'] != current['qgl']:
+                    send('QGL', current['index'], target['qgl'])
+
+            if qsl != current_qsl:
+                send('QSL', qsl)
+
+        return sent
+
+
+    class Settings(object):
+        """
+            Device Settings
+
+            With a `ttl` (seconds) set, reads are answered from a cache which
+            setters write through. The cache is dropped after ttl, on clear()
+            and when the device leaves Program Mode.
+
+        """
+
+        class BACKLIGHT:
+            INFINITE = 'IF'
+            TEN_SEC = '10'
+            THIRTY_SEC = '30'
+            KEYPRESS = 'KY'
+            SQUELCH = 'SQ'
+
+        def __init__(self, device, ttl=None):
+            """ Initialize Settings """
+
+            self.device = device
+            self.ttl = ttl
+            self._cache = {}
+
+        def invalidate(self):
+            """ Drop cached settings """
+
+            self._cache.clear()
+
+        def _read(self, command, **kwargs):
+            """ Read setting through the cache """
+
+            if self.ttl is not None and command in self._cache:
+                value, expires = self._cache[command]
+                if time.time() < expires:
+                    return dict(value) if isinstance(value, dict) else value
+
+            value = self.device.command(command, **kwargs)
+            if self.ttl is not None:
+                self._cache[command] = (value, time.time() + self.ttl)
+
+            return value
+
+        def _write(self, command, *args):
+            """ Write setting through the cache """
+
+            self._cache.pop(command, None)
+            response = self.device.command(command, *args)
+            # single values are read back as sent, messages may come back as the default
+            if self.ttl is not None and len(args) == 1:
+                value = str(args[0])
+                if self.device.typed:
+                    value = Schema.decoder(command)(value)
+                self._cache[command] = (value, time.time() + self.ttl)
+
+            return response
+
+        def clear(self):
+            """
+                Clear All Memory
+
+                All settings are returned to default values.
+                Only PC Control (Baud Rate) retains its value.
+
+                Controller -> Radio
+                    1: CLR
+
+                Radio -> Controller
+                    1: CLR,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+                      This command needs about 10 seconds execution time.
+
+            """
+
+            try:
+                response = self.device.command('CLR')
+            finally:
+                self.invalidate()
+
+            return response
+
+
+        @property
+        def backlight(self):
+            """
+                Get Backlight
+
+                Get Backlight Setting.
+
+                Controller -> Radio
+                    1: BLT
+
+                Radio -> Controller
+                    1: BLT,##
+
+                        ##              : Backlight Setting (see BACKLIGHT class)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return self._read('BLT')
+
+        @backlight.setter
+        def backlight(self, value):
+            """
+                Set Backlight
+
+                Set Backlight Setting.
+
+                Controller -> Radio
+                    1: BLT,##
+
+                        ##              : Backlight Setting (see BACKLIGHT class)
+
+                Radio -> Controller
+                    1: BLT,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            self._write('BLT', value)
+
+        @property
+        def battery_save(self):
+            """
+                Get Battery Save
+
+                Get Battery Save Setting.
+
+                Controller -> Radio
+                    1: BSV
+
+                Radio -> Controller
+                    1: BSV,#
+
+                        #               : Battery Save Setting (See TOGGLE class)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self._read('BSV'))
+
+        @battery_save.setter
+        def battery_save(self, value):
+            """
+                Set Battery Save
+
+                Set Battery Save Setting.
+
+                Controller -> Radio
+                    1: BSV,#
+
+                        #               : Battery Save Setting (See TOGGLE class)
+
+                Radio -> Controller
+                    1: BSV,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            self._write('BSV', value)
+
+        @property
+        def key_beep(self):
+            """
+                Get Key Beep
+
+                Get Key Beep Setting.
+
+                Controller -> Radio
+                    1: KBP
+
+                Radio -> Controller
+                    1: KBP,#
+
+                        #             : Key Beep Setting (See TOGGLE class)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self._read('KBP'))
+
+        @key_beep.setter
+        def key_beep(self, value):
+            """
+                Set Key Beep
+
+                Set Key Beep Setting.
+
+                Controller -> Radio
+                    1: KBP,#
+
+                        #              : Key Beep Setting (See TOGGLE class)
+
+                Radio -> Controller
+                    1: KBP,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            self._write('KBP', value)
+
+        @property
+        def opening_message(self):
+            """
+                Get Opening Message
+
+                Controller -> Radio
+                    1: OMS
+
+                Radio -> Controller
+                    1: OMS,[L1_CHAR],[L2_CHAR]
+
+                        [L1_CHAR]       : Line1 Characters (max 16char)
+                        [L2_CHAR]       : Line2 Characters (max 16char)
+
+                NOTE: This command is only acceptable in Programming Mode.
+                      If only space code is set in character area, the command returns the default message.
+
+            """
+
+            return self._read('OMS', keys=('l1_char', 'l2_char'))
+
+        @opening_message.setter
+        def opening_message(self, message):
+            """
+                Set Opening Message
+
+                Controller -> Radio
+                    1: OMS,[L1_CHAR],[L2_CHAR]
+
+                        [L1_CHAR]       : Line1 Characters (max 16char)
+                        [L2_CHAR]       : Line2 Characters (max 16char)
+
+                Radio -> Controller
+                    1: OMS,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            l1_char, l2_char = message
+            self._write('OMS', l1_char, l2_char)
+
+        @property
+        def priority_mode(self):
+            """
+                Get Priority Mode
+
+                Get Priority Mode Setting.
+
+                Controller -> Radio
+                    1: PRI
+
+                Radio -> Controller
+                    1: PRI,#
+
+                        #               : Priority Mode Setting (See TOGGLE class)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self._read('PRI'))
+
+        @priority_mode.setter
+        def priority_mode(self, value):
+            """
+                Set Priority Mode
+
+                Set Priority Mode Setting.
+
+                Controller -> Radio
+                    1: PRI,#
+
+                        #               : Priority Mode Setting (See TOGGLE class)
+
+                Radio -> Controller
+                    1: PRI,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            self._write('PRI', value)
+
+    Settings.TOGGLE = TOGGLE
+
+
+    class System(object):
+        """ Device System """
+
+        class SYS_TYPE:
+            CONVENTIONAL = 'CNV'
+            MOT_800_T2_STD = 'M82S'
+            MOT_800_T2_SPL = 'M82P'
+            MOT_900_T2 = 'M92'
+            MOT_VHF_T2 = 'MV2'
+            MOT_UHF_T2 = 'MU2'
+            MOT_800_T1_STD = 'M81S'
+            MOT_800_T1_SPL = 'M81P'
+            EDACS_NARROW = 'EDN'
+            EDACS_WIDE = 'EDW'
+            EDACS_SCAT = 'EDS'
+            LTR = 'LTR'
+            MOT_800_T2_CUS = 'M82C'
+            MOT_800_T1_CUS = 'M81C'
+
+        class QUICK_KEY:
+            ONE = 1
+            TWO = 2
+            THREE = 3
+            FOUR = 4
+            FIVE = 5
+            SIX = 6
+            SEVEN = 7
+            EIGHT = 8
+            NINE = 9
+            TEN = 0
+            NONE = '.'
+
+        class LOUT:
+            UNLOCKED = 0
+            LOCKED = 1
+
+        class EMG:
+            IGNORE = 0
+            ALERT = 1
+
+        # SIN response fields, fetched on first access for stored systems
+        INFO = ('sys_type', 'name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg', 'rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail', 'seq_no')
+
+        def __init__(self, device, index=None, sys_type=SYS_TYPE.CONVENTIONAL, name=None, quick_key=None, hld=None, lout=None, att=None, dly=None, skp=None, emg=None):
+            """ Initialize System """
+
+            self.device = device
+
+            self.index = index
+            if index is not None:
+                return
+
+            self.sys_type = sys_type
+            self.name = name
+            self.quick_key = quick_key
+            self.hld = hld
+            self.lout = lout
+            self.att = att
+            self.dly = dly
+            self.skp = skp
+            self.emg = emg
+
+            self.rev_index = -1
+            self.fwd_index = -1
+            self.chn_grp_head = -1
+            self.chn_grp_tail = -1
+            self.seq_no = -1
+
+        def __getattr__(self, name):
+            """ Fetch system info on first access of an unloaded field """
+
+            if name in self.INFO and self.__dict__.get('_index') is not None:
+                self.refresh()
+                return self.__dict__[name]
+
+            raise AttributeError(name)
+
+        @property
+        def index(self):
+            """ System Index getter """
+
+            index = self.__dict__.get('_index')
+            return -1 if index is None else int(index)
+
+        @index.setter
+        def index(self, index):
+            """ System Index setter (info is fetched again on next access) """
+
+            self._index = index
+            if index is not None:
+                for key in self.INFO:
+                    self.__dict__.pop(key, None)
+
+        def refresh(self):
+            """ Reload system info """
+
+            return self.load(self.device.systems.info(self.index))
+
+        def load(self, info):
+            """ Set system info from a Device.Systems.info response """
+
+            for key, value in info.items():
+                setattr(self, key, value)
+
+            return self
+
+        def info(self):
+            """ Device.Systems.info pass-through """
+
+            if self.index == -1:
+                raise CommandUnavailableException
+
+            return self.device.systems.info(self.index)
+
+        def remove(self):
+            """ Device.Systems.remove pass-through """
+
+            if self.index == -1:
+                raise CommandUnavailableException
+
+            return self.device.systems.remove(self.index)
+
+        def group_quick_lockout(self, value=None):
+            """ Device.Systems.group_quick_lockout pass-through """
+
+            if self.index == -1:
+                raise CommandUnavailableException
+
+            return self.device.systems.group_quick_lockout(self.index, value)
+
+    System.TOGGLE = TOGGLE
+
+
+    class Systems(list):
+        """ Device Systems """
+
+        # settable SIN fields
+        FIELDS = ('name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg')
+
+        def __init__(self, device):
+            """ Initialize Systems """
+
+            self.device = device
+
+        def __len__(self):
+            """
+                Get System Count
+
+                Returns the number of stored Systems.
+
+                Controller -> Radio
+                    1: SCT
+
+                Radio -> Controller
+                    1:SCT,###
+
+                        ###             : Number of Systems (0-200)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self.device.command('SCT'))
+
+        def __iter__(self):
+            """ Iterate stored systems in list order (head to tail by FWD_INDEX) """
+
+            return self._walk(self.head, self.tail, 'fwd_index')
+
+        def __reversed__(self):
+            """ Iterate stored systems in reverse list order (tail to head by REV_INDEX) """
+
+            return self._walk(self.tail, self.head, 'rev_index')
+
+        def _raw(self):
+            """ Iterate raw SIN info (with index) of stored systems in list order, typed Device or not """
+
+            index, last = self.head, self.tail
+            while index != -1:
+                info = self._raw_info(index)
+                yield info
+                if index == last:
+                    return
+                index = int(info['fwd_index'])
+
+        def _raw_info(self, index):
+            """ Get raw SIN info (with index) of a system """
+
+            info = self.device.command('SIN', index, keys=Device.System.INFO, intern=('name',), schema=None)
+            return dict(info, index=str(index))
+
+        def _walk(self, first, last, link):
+            """ Follow list pointers from first to last, one SIN per system """
+
+            index = first
+            while index != -1:
+                system = Device.System(self.device, index).refresh()
+                yield system
+                if index == last:
+                    return
+                index = int(getattr(system, link))
+
+        def __getitem__(self, index):
+            """ Get System by index, or a list of Systems by list position slice """
+
+            if not isinstance(index, slice):
+                return Device.System(self.device, index)
+
+            start, stop, step = index.start or 0, index.stop, index.step or 1
+            if step > 0 and start >= 0 and (stop is None or stop >= 0):
+                return list(itertools.islice(iter(self), start, stop, step))
+
+            count = len(self)
+            start, stop, step = index.indices(count)
+            if step > 0:
+                return list(itertools.islice(iter(self), start, stop, step))
+
+            return list(itertools.islice(reversed(self), count - 1 - start, count - 1 - stop, -step))
+
+        def __str__(self):
+            return str([system.index for system in self])
+
+        @property
+        def head(self):
+            """
+                Get System Index Head
+
+                Returns the first index of stored system list.
+
+                Controller -> Radio
+                    1: SIH
+
+                Radio -> Controller
+                    1:SIH,[SYS_INDEX]
+
+                        [SYS_INDEX]     : System Index
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self.device.command('SIH'))
+
+        @property
+        def tail(self):
+            """
+                Get System Index Tail
+
+                Returns the last index of stored system list.
+
+                Controller -> Radio
+                    1: SIT
+
+                Radio -> Controller
+                    1:SIT,[SYS_INDEX]
+
+                        [SYS_INDEX]     : System Index
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return int(self.device.command('SIT'))
+
+        def append(self, system):
+            """
+                Create System
+
+                Creates a system and returns created system index.
+
+                Controller -> Radio
+                    1: CSY,[SYS_TYPE]
+
+                        [SYS_TYPE]      : System Type (See Device.System.SYS_TYPE class)
+
+                Radio -> Controller
+                    1: CSY,[SYS_INDEX]
+
+                        [SYS_INDEX]     : The Index if Created System
+
+                NOTE: The index is a handle to get/set system information.
+                      Returns -1 if the scanner failed to create because of no resource.
+                      This command is only acceptable in Programming Mode.
+
+            """
+
+            system.index = self.device.command('CSY', system.sys_type)
+
+        def remove(self, index):
+            """
+                Delete System
+
+                Deletes a system.
+
+                Controller -> Radio
+                    1: DSY,[SYS_INDEX]
+
+                    [SYS_INDEX]     : System Index
+
+                Radio -> Controller
+                    1: DSY,OK
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return self.device.command('DSY', index)
+
+        def info(self, index, name=None, quick_key=None, hld=None, lout=None, att=None, dly=None, skp=None, emg=None):
+            """
+                Get/Set System Info
+
+                Get/Set System Information.
+
+                Controller -> Radio
+                    1: SIN,[INDEX]
+
+                    [INDEX]         : System Index
+
+                    2: SIN,[INDEX],[NAME],[QUICK_KEY],[HLD],[LOUT],[ATT],[DLY],[SKP],[EMG]
+
+                    [INDEX]         : System Index
+                    [NAME]          : Name (max 16char)
+                    [QUICK_KEY]     : Quick Key (See QUICK_KEY class)
+                    [HLD]           : System Hold Time (0-255)
+                    [LOUT]          : Lockout (See LOUT class)
+                    [ATT]           : Attenuation (See TOGGLE class)
+                    [DLY]           : Delay Time (0-5)
+                    [SKP]           : Data Skip (See TOGGLE class)
+                    [EMG]           : Emergency Alert (See EMG class)
+
+                Radio -> Controller
+                    1: SIN,[SYS_TYPE],[NAME],[QUICK_KEY],[HLD],[LOUT],[ATT],[DLY],[SKP],[EMG],[REV_INDEX],[FWD_INDEX],[CHN_GRP_HEAD],[CHN_GRP_TAIL],[SEQ_NO]
+
+                    [SYS_TYPE]      : System Type (See Device.System.SYS_TYPE class)
+                    [NAME]          : Name (max 16char)
+                    [QUICK_KEY]     : Quick Key (See QUICK_KEY class)
+                    [HLD]           : System Hold Time (0-255)
+                    [LOUT]          : Lockout (See LOUT class)
+                    [ATT]           : Attenuation (See TOGGLE class)
+                    [DLY]           : Delay Time (0-5)
+                    [SKP]           : Data Skip (See TOGGLE class)
+                    [EMG]           : Emergency Alert (See EMG class)
+                    [REV_INDEX]     : Reverse System Index
+                    [FWD_INDEX]     : Forward System Index
+                    [CHN_GRP_HEAD]  : Channel Group Index Head
+                    [CHN_GRP_TAIL]  : Channel Group Index Tail
+                    [SEQ_NO]        : System Sequence Number (1-200)
+
+                    2: SIN,OK
+
+                NOTE: The scanner does not return a value for parameters which are not appropriate for the system type.
+                      The scanner does not set a value for parameters which are not appropriate for the system type.
+                      Only provided parameters are changed.
+                      The command is aborted if any format error is detected.
+                      This command is only acceptable in Programming Mode.
+
+            """
+
+            if [value for value in (name, quick_key, hld, lout, att, dly, skp, emg) if value is not None]:
+                return self.device.command('SIN', index, name, quick_key, hld, lout, att, dly, skp, emg)
+
+            return self.device.command('SIN', index, keys=('sys_type', 'name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg', 'rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail', 'seq_no'), intern=('name',))
+
+        @property
+        def system_quick_lockout(self):
+            """
+                Get System Quick Lockout
+
+                Returns the System Quick Key status.
+
+                Controller -> Radio
+                    1: QSL
+
+                Radio -> Controller
+                    1: QSL,##########
+
+                    ##########      : System Quick Key status (See TOGGLE class)
+
+                NOTE: This command is only acceptable in Programming Mode.
+
+            """
+
+            return self.device.command('QSL')
+
+        @system_quick_lockout.setter
+        def system_quick_lockout(self, value):
+            """
+                Set System Quick Lockout
+
+                Sets the System Quick Key status.
+
+                Controller -> Radio
+                    1: QSL,##########
+
+                    ##########      : System Quick Key status (See TOGGLE class)
+
+                Radio -> Controller
+                    1: QSL,OK
+
+                NOTE: This cannot turn on/off a Quick Key that has no System.
+                      This command is only acceptable in Programming Mode.
+
+            """
+
+            return self.device.command('QSL', value)
+
+        def group_quick_lockout(self, index, value=None):
+            """
+                Get/Set Group Quick Lockout
+
+                Returns/Sets Group Quick Key status of a System
+
+                Controller -> Radio
+                    1: QGL,[SYS_INDEX]
+                    2: QGL,[SYS_INDEX],##########
+
+                    ##########      : System Quick Key status (See TOGGLE class)
+
+                Radio -> Controller
+                    1: QGL,##########
+                    2: QGL,OK
+
+                    ##########      : System Quick Key status (See TOGGLE class)
+
+                NOTE: This cannot turn on/off a Quick Key that has no Group.
+                      This command is only acceptable in Programming Mode.
+
+            """
+
+            return self.device.command('QGL', index, value)
+
+        def sync(self, systems):
+            """
+                Synchronize System List
+
+                Brings the stored systems in line with `systems` (dicts or System
+                objects holding at least sys_type and name) in one Program Mode
+                session, using the fewest commands:
+
+                    Stored systems are indexed by (name, sys_type) from one list read.
+                    Matched systems get SIN/QGL only for fields that differ.
+                    Unmatched stored systems are deleted (DSY).
+                    Missing systems are created (CSY) and set (SIN/QGL).
+
+                Returns the list of commands sent.
+
+                NOTE: Fields left as None are not changed. Stored systems keep their
+                      list order, created systems are appended to the list.
+
+            """
+
+            sent = []
+
+            def send(command, *args):
+                sent.append((command,) + args)
+                return self.device.command(command, *args)
+
+            targets = [self._target(system) for system in systems]
+
+            with self.device.programming():
+                stored = {}
+                for info in self._raw():
+                    stored.setdefault((info['name'], info['sys_type']), []).append(info)
+
+                matched, created = [], []
+                for target in targets:
+                    candidates = stored.get((target['name'], target['sys_type']))
+                    if candidates:
+                        matched.append((candidates.pop(0), target))
+                    else:
+                        created.append(target)
+
+                # delete first, freeing resources for created systems
+                for candidates in stored.values():
+                    for info in candidates:
+                        send('DSY', info['index'])
+
+                for info, target in matched:
+                    changes = [target.get(key) if target.get(key) != info[key] else None for key in self.FIELDS]
+                    if [value for value in changes if value is not None]:
+                        send('SIN', info['index'], *changes)
+                    if 'qgl' in target and target['qgl'] != self.device.command('QGL', info['index'], schema=None):
+                        send('QGL', info['index'], target['qgl'])
+
+                for target in created:
+                    index = send('CSY', target['sys_type'])
+                    if int(index) == -1:
+                        raise DeviceErrorException
+                    send('SIN', index, *[target.get(key) for key in self.FIELDS])
+                    if 'qgl' in target:
+                        send('QGL', index, target['qgl'])
+
+            return sent
+
+        def _target(self, system):
+            """ Normalize a target system to a dict of strings """
+
+            if not isinstance(system, dict):
+                system = dict((key, getattr(system, key, None)) for key in ('sys_type', 'qgl') + self.FIELDS)
+
+            return dict((key, str(value)) for key, value in system.items() if value is not None)
+
+    Systems.TOGGLE = TOGGLE
+
+
+    class Pipeline(object):
+        """
+            Device Pipeline
+
+            Queues commands and writes them back-to-back, keeping up to `depth`
+            commands in flight on the serial link. CR-terminated responses are
+            matched to their commands by the echoed opcode prefix.
+
+                with dev.pipeline() as p:
+                    status = p.command('STS')
+                    talkgroup = p.command('GID')
+                print(status.result(), talkgroup.result())
+
+            NOTE: Responses without an opcode prefix (ERR, FER, ORER) belong to the
+                  oldest command in flight. Commands skipped over by a later
+                  matching response raise SerialTimeoutException, as does every
+                  command of a run of same opcode commands missing a response.
+
+        """
+
+        def __init__(self, device, depth=4):
+            """ Initialize Pipeline """
+
+            self.device = device
+            self.depth = depth
+            self.queue = collections.deque()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, type, value, traceback):
+            if type is None:
+                self.flush()
+            else:
+                self.cancel()
+
+        def command(self, command, *args, **kwargs):
+            """ Queue Raw Command, returning a Future of its response """
+
+            future = Future(self.flush)
+            if self.device.typed and 'schema' not in kwargs:
+                kwargs['schema'] = Schema.decoder(command)
+            self.queue.append((future, command, self.device.frame(command, *args), kwargs))
+            return future
+
+        def cancel(self):
+            """ Drop queued commands """
+
+            while self.queue:
+                self.queue.popleft()[0].set_exception(SerialTimeoutException())
+
+        def flush(self):
+            """ Execute queued commands """
+
+            serial = self.device.serial
+            framer = self.device.framer
+            in_flight = collections.deque()
+            # answered commands whose run of same opcode commands is in flight
+            run = []
+
+            while self.queue or in_flight:
+                while self.queue and len(in_flight) < self.depth:
+                    pending = self.queue.popleft()
+                    serial.write(pending[2])
+                    in_flight.append(pending)
+
+                timeout = self.device.policy.timeout(in_flight[0][1])
+                if serial.timeout != timeout:
+                    serial.timeout = timeout
+
+                response = framer.readline()
+                opcode = response.strip().split(',', 1)[0]
+
+                if opcode not in ('', 'ERR', 'FER', 'ORER'):
+                    if opcode not in [pending[1] for pending in in_flight]:
+                        continue
+                    # commands answered out of turn never got their response
+                    while in_flight[0][1] != opcode:
+                        pending = in_flight.popleft()
+                        run.append((pending[0], pending[1], None, SerialTimeoutException()))
+                        self._settle(run, in_flight)
+
+                future, command, raw_command, kwargs = in_flight.popleft()
+                try:
+                    run.append((future, command, self.device.decode(response, **kwargs), None))
+                except Exception as error:
+                    run.append((future, command, None, error))
+                self._settle(run, in_flight)
+
+        def _settle(self, run, in_flight):
+            """
+                Set the held results of a run of same opcode commands once it ends
+
+                Responses are matched by opcode only, so one lost response shifts
+                every later response of the run onto the wrong command (ex: SIN of
+                the next system). A run with a timed out command fails as a whole.
+
+            """
+
+            following = in_flight[0] if in_flight else self.queue[0] if self.queue else None
+            if following is not None and following[1] == run[-1][1]:
+                return
+
+            lost = any(isinstance(error, SerialTimeoutException) for future, command, result, error in run)
+            for future, command, result, error in run:
+                if lost:
+                    future.set_exception(SerialTimeoutException())
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            del run[:]
+
+
+    class Batch(Pipeline):
+        """
+            Device Batch
+
+            Collects reads made through the Settings and Systems interfaces and
+            sends them in one pipelined burst when the batch exits.
+
+                with dev.batch() as b:
+                    for index in indexes:
+                        b.systems.info(index)
+                systems = b.results
+
+            System indexes are not contiguous (See Device.Systems iteration), so
+            `indexes` must be known ones (ex: of a Snapshot) rather than a range.
+
+            Each call returns a Future of its parsed response (using the same keys
+            as Device.command). Batch.results lists them in call order.
+
+            NOTE: Only calls returning the parsed response unchanged can be batched
+                  (ex: not len(), head, tail or battery_save).
+
+        """
+
+        def __init__(self, device, depth=8):
+            """ Initialize Batch """
+
+            Device.Pipeline.__init__(self, device, depth)
+            self.futures = []
+            self.settings = Device.Settings(self)
+            self.systems = Device.Systems(self)
+
+        def command(self, command, *args, **kwargs):
+            """ Queue Raw Command, returning a Future of its response """
+
+            future = Device.Pipeline.command(self, command, *args, **kwargs)
+            self.futures.append(future)
+            return future
+
+        @property
+        def results(self):
+            """ Get parsed responses in call order, raising the first error """
+
+            return [future.result() for future in self.futures]
+
+
+class SharedDevice(Device):
+    """
+        Thread-safe Device
+
+        A Device which may be shared by several threads. Callers queue their
+        command frames; one writer thread sends them, lowest priority first, with
+        up to `depth` commands in flight, and one reader thread hands each
+        response line to the caller waiting for it (matched by opcode, as in
+        Device.Pipeline). Responses are decoded in the calling thread.
+
+            with SharedDevice('/dev/ttyUSB0') as dev:
+                threading.Thread(target=poll, args=(dev,)).start()
+                dev.key(Device.KEY_CODE.HOLD)   # sent ahead of queued bulk reads
+
+        Priorities come from `priorities` (default PRIORITIES) by opcode:
+        interactive commands first, bulk Program Mode reads last.
+
+        If the port fails (ex: the radio is unplugged), commands in flight or
+        queued raise the port's exception, as does every later command.
+
+        NOTE: Device.Pipeline and Device.Batch use the serial port directly and
+              must not be used with a SharedDevice.
+
+    """
+
+    class PRIORITY:
+        INTERACTIVE = 0
+        NORMAL = 1
+        BULK = 2
+
+    PRIORITIES = {
+        'KEY': PRIORITY.INTERACTIVE,
+        'QSH': PRIORITY.INTERACTIVE,
+        'POF': PRIORITY.INTERACTIVE,
+        'SIN': PRIORITY.BULK,
+        'QGL': PRIORITY.BULK,
+        'SCT': PRIORITY.BULK,
+        'SIH': PRIORITY.BULK,
+        'SIT': PRIORITY.BULK,
+    }
+
+    # read timeout of the reader thread, bounding how late a command times out
+    POLL = 0.02
+    # time a caller waits for its queued command beyond the command's timeout
+    MARGIN = 5.0
+
+    def __init__(self, port, depth=1, priorities=None, **kwargs):
+        """ Initialize SharedDevice """
+
+        Device.__init__(self, port, **kwargs)
+        self.depth = depth
+        self.priorities = dict(self.PRIORITIES, **(priorities or {}))
+        self.serial.timeout = self.POLL
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._slots = threading.Semaphore(depth)
+        self._in_flight = collections.deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._error = None
+
+        self._writer = threading.Thread(target=self._write, name="SharedDevice(%s) writer" % self.port)
+        self._reader = threading.Thread(target=self._read, name="SharedDevice(%s) reader" % self.port)
+        for thread in (self._writer, self._reader):
+            thread.daemon = True
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        """ Stop once queued commands are answered, then close port """
+
+        self._queue.put((float('inf'), next(self._sequence), None, None, None, None))
+        self._writer.join()
+        while self._in_flight and self._error is None:
+            time.sleep(self.POLL)
+        self._closed = True
+        self._reader.join()
+        self.serial.close()
+
+    def _exchange(self, command, raw_command, timeout):
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise OSError("%s: SharedDevice is closed" % self.port)
+
+        future = Future()
+        self._queue.put((self.priorities.get(command, self.PRIORITY.NORMAL), next(self._sequence), command, raw_command, timeout, future))
+        try:
+            return future.result(timeout + self.MARGIN)
+        except SerialTimeoutException:
+            if future.done():
+                raise
+            # still queued behind other commands: cancel it (the writer drops done
+            # futures) and fail like a timed out command
+            with self._lock:
+                if not any(entry[1] is future for entry in self._in_flight):
+                    future.set_exception(SerialTimeoutException())
+            return ''
+
+    def _resync(self):
+        # the reader thread drops late responses
+        pass
+
+    def _write(self):
+        while True:
+            priority, sequence, command, raw_command, timeout, future = self._queue.get()
+            if future is None:
+                return
+            if future.done():
+                continue
+
+            self._slots.acquire()
+            with self._lock:
+                if future.done():
+                    self._slots.release()
+                    continue
+                if self._error is not None:
+                    future.set_exception(self._error)
+                    self._slots.release()
+                    continue
+                self._in_flight.append([command, future, timeout, time.time()])
+            try:
+                self._serial.write(raw_command)
+            except Exception as error:
+                self._fail(error)
+
+    def _read(self):
+        try:
+            while not self._closed:
+                response = self.framer.readline()
+                if response:
+                    self._answer(response, time.time())
+                else:
+                    self._expire(time.time())
+        except Exception as error:
+            self._fail(error)
+
+    def _fail(self, error):
+        """ Stop on a port error, raising it from every pending and later command """
+
+        with self._lock:
+            if self._error is None:
+                self._error = error
+            self._closed = True
+            while self._in_flight:
+                future = self._in_flight.popleft()[1]
+                future.set_exception(self._error)
+                self._slots.release()
+
+        # commands still queued (the writer fails those it has already taken)
+        while True:
+            try:
+                priority, sequence, command, raw_command, timeout, future = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if future is None:
+                # leave the stop request to the writer
+                self._queue.put((priority, sequence, command, raw_command, timeout, future))
+                return
+            future.set_exception(self._error)
+
+    def _answer(self, response, now):
+        """ Hand response to its command, failing commands answered out of turn """
+
+        opcode = response.strip().split(',', 1)[0]
+        with self._lock:
+            in_flight = self._in_flight
+            if not in_flight:
+                return
+            if opcode not in ('ERR', 'FER', 'ORER'):
+                if opcode not in [pending[0] for pending in in_flight]:
+                    return
+                while in_flight[0][0] != opcode:
+                    self._finish(in_flight.popleft()[1], '')
+
+            self._finish(in_flight.popleft()[1], response)
+            # the next command's timeout runs from now
+            if in_flight:
+                in_flight[0][3] = max(in_flight[0][3], now)
+
+    def _expire(self, now):
+        """ Time out the oldest command once its timeout passed without a response """
+
+        with self._lock:
+            in_flight = self._in_flight
+            if in_flight and now - in_flight[0][3] >= in_flight[0][2]:
+                self._finish(in_flight.popleft()[1], '')
+                if in_flight:
+                    in_flight[0][3] = max(in_flight[0][3], now)
+
+    def _finish(self, future, response):
+        future.set_result(response)
+        self._slots.release()
@@ -0,0 +1,184 @@
+"""
+BC246T Instrumentation Hooks
+
+Collectors called around each Device.command (See Hook class).
+"""
+
+import os
+import time
+import threading
+
+from .device import Device
+
+
+class Hook(object):
+    """
+        Device.command Instrumentation Hook
+
+        Hooks in Device.hooks are called around every command
+            before(device, opcode, args)
+            after(device, opcode, args, written, read, elapsed, error)
+
+        with the bytes written and read on the wire (retries included), the
+        elapsed time in seconds and the raised exception (or None). A Device
+        without hooks only pays for an empty list test.
+
+    """
+
+    def before(self, device, opcode, args):
+        pass
+
+    def after(self, device, opcode, args, written, read, elapsed, error):
+        pass
+
+
+class Histogram(Hook):
+    """
+        In-memory Latency Histogram
+
+        Counts commands per opcode into cumulative latency BUCKETS (seconds),
+        with errors by exception name and bytes on the wire. With samples=True
+        every latency is also kept for exact percentiles (See Benchmark class).
+
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=BUCKETS, samples=False):
+        """ Initialize Histogram """
+
+        self.buckets = tuple(buckets)
+        self.keep_samples = samples
+        self.opcodes = {}
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def after(self, device, opcode, args, written, read, elapsed, error):
+        with self._lock:
+            stats = self.opcodes.get(opcode)
+            if stats is None:
+                stats = self.opcodes[opcode] = {'count': 0, 'sum': 0.0, 'written': 0, 'read': 0, 'errors': {}, 'buckets': [0] * len(self.buckets)}
+            stats['count'] += 1
+            stats['sum'] += elapsed
+            stats['written'] += written
+            stats['read'] += read
+            if error is not None:
+                name = type(error).__name__
+                stats['errors'][name] = stats['errors'].get(name, 0) + 1
+            counts = stats['buckets']
+            for i, bound in enumerate(self.buckets):
+                if elapsed <= bound:
+                    counts[i] += 1
+            if self.keep_samples:
+                self.samples.setdefault(opcode, []).append(elapsed)
+
+    def reset(self):
+        with self._lock:
+            self.opcodes.clear()
+            self.samples.clear()
+
+    def line_time(self):
+        """ Get (opcode, seconds, share of total) tuples, most time first """
+
+        with self._lock:
+            total = sum(stats['sum'] for stats in self.opcodes.values())
+            return sorted(((opcode, stats['sum'], stats['sum'] / total if total else 0.0) for opcode, stats in self.opcodes.items()),
+                          key=lambda entry: -entry[1])
+
+
+class PrometheusExporter(Histogram):
+    """
+        Prometheus Text File Exporter
+
+        A Histogram written to `path` in the Prometheus text format (ex: for the
+        node_exporter textfile collector) at most every `interval` seconds and on
+        write(). The file is replaced atomically. `labels` are added to each sample.
+
+    """
+
+    PREFIX = 'bc246t'
+
+    def __init__(self, path, interval=15.0, labels=None, buckets=Histogram.BUCKETS):
+        """ Initialize PrometheusExporter """
+
+        Histogram.__init__(self, buckets)
+        self.path = path
+        self.interval = interval
+        self.labels = dict(labels or {})
+        self._written = 0
+
+    def after(self, device, opcode, args, written, read, elapsed, error):
+        Histogram.after(self, device, opcode, args, written, read, elapsed, error)
+        if time.time() - self._written >= self.interval:
+            self.write()
+
+    def _labels(self, **labels):
+        labels = dict(self.labels, **labels)
+        return ','.join('%s="%s"' % (name, str(labels[name]).replace('\\', '\\\\').replace('"', '\\"')) for name in sorted(labels))
+
+    def text(self):
+        """ Get metrics in the Prometheus text format """
+
+        prefix = self.PREFIX
+        lines = [
+            '# HELP %s_command_duration_seconds Device.command latency, retries included.' % prefix,
+            '# TYPE %s_command_duration_seconds histogram' % prefix,
+        ]
+        with self._lock:
+            opcodes = sorted(self.opcodes.items())
+            for opcode, stats in opcodes:
+                for bound, count in zip(self.buckets, stats['buckets']):
+                    lines.append('%s_command_duration_seconds_bucket{%s} %d' % (prefix, self._labels(opcode=opcode, le=repr(bound)), count))
+                lines.append('%s_command_duration_seconds_bucket{%s} %d' % (prefix, self._labels(opcode=opcode, le='+Inf'), stats['count']))
+                lines.append('%s_command_duration_seconds_sum{%s} %r' % (prefix, self._labels(opcode=opcode), stats['sum']))
+                lines.append('%s_command_duration_seconds_count{%s} %d' % (prefix, self._labels(opcode=opcode), stats['count']))
+
+            lines.append('# HELP %s_command_errors_total Device.command exceptions.' % prefix)
+            lines.append('# TYPE %s_command_errors_total counter' % prefix)
+            for opcode, stats in opcodes:
+                for error, count in sorted(stats['errors'].items()):
+                    lines.append('%s_command_errors_total{%s} %d' % (prefix, self._labels(opcode=opcode, error=error), count))
+
+            for name in ('written', 'read'):
+                lines.append('# HELP %s_bytes_%s_total Bytes %s on the serial line.' % (prefix, name, name))
+                lines.append('# TYPE %s_bytes_%s_total counter' % (prefix, name))
+                for opcode, stats in opcodes:
+                    lines.append('%s_bytes_%s_total{%s} %d' % (prefix, name, self._labels(opcode=opcode), stats[name]))
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """ Write metrics to path """
+
+        self._written = time.time()
+        temporary = '%s.%d' % (self.path, os.getpid())
+        with open(temporary, 'w') as f:
+            f.write(self.text())
+        os.rename(temporary, self.path)
+
+
+class TraceLog(Hook):
+    """
+        Command Trace Log
+
+        Writes one line per command to `f` (a file object or path)
+            time port opcode,args written read elapsed result
+
+        where result is OK or the name of the raised exception.
+
+    """
+
+    def __init__(self, f):
+        """ Initialize TraceLog """
+
+        self.f = open(f, 'a') if isinstance(f, str) else f
+        self._lock = threading.Lock()
+
+    def after(self, device, opcode, args, written, read, elapsed, error):
+        line = '%.6f %s %s %d %d %.6f %s\n' % (time.time(), device.port, Device.encode(opcode, *args).rstrip('\r'),
+                                              written, read, elapsed, 'OK' if error is None else type(error).__name__)
+        with self._lock:
+            self.f.write(line)
+
+    def close(self):
+        self.f.close()
@@ -0,0 +1,134 @@
+"""
+BC246T Device Pool
+"""
+
+import glob
+import threading
+import itertools
+import queue
+
+from .device import Device
+from .protocol import SerialTimeoutException, Future
+
+
+class DevicePool(object):
+    """
+        Device Pool
+
+        Owns a Device per port, each driven by its own worker thread, so a slow
+        or timed out radio only delays its own jobs.
+
+            with DevicePool() as pool:      # every /dev/ttyUSB* port
+                statuses = [future.result() for future in pool.broadcast(lambda dev: dev.status)]
+
+        Jobs are callables taking a Device, returning a Future of their result.
+        Jobs submitted without a port are scheduled round-robin, passing over
+        ports whose last job timed out while others are healthy. Each worker
+        runs its queued jobs lowest priority value first, FIFO within a priority.
+
+    """
+
+    PATTERN = '/dev/ttyUSB*'
+
+    def __init__(self, ports=None, baudrate=57600, timeout=0.1, pattern=PATTERN):
+        """ Initialize DevicePool """
+
+        if ports is None:
+            ports = sorted(glob.glob(pattern))
+
+        self.workers = []
+        for port in ports:
+            device = port if isinstance(port, Device) else Device(port, baudrate=baudrate, timeout=timeout)
+            self.workers.append(self.Worker(device))
+        for worker in self.workers:
+            worker.start()
+
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.workers)
+
+    @property
+    def devices(self):
+        return [worker.device for worker in self.workers]
+
+    def submit(self, job, port=None, priority=0):
+        """ Queue job on port (or the next port round-robin) """
+
+        if port is not None:
+            worker = [worker for worker in self.workers if worker.device.port == port or worker.device is port][0]
+        else:
+            worker = self._schedule()
+
+        return worker.submit(job, priority)
+
+    def broadcast(self, job, priority=0):
+        """ Queue job on every port """
+
+        return [worker.submit(job, priority) for worker in self.workers]
+
+    def map(self, job, items, priority=0):
+        """ Queue job(device, item) for each item, round-robin across ports """
+
+        return [self.submit(lambda device, item=item: job(device, item), priority=priority) for item in items]
+
+    def close(self):
+        """ Stop workers once their queued jobs are done """
+
+        for worker in self.workers:
+            worker.stop()
+        for worker in self.workers:
+            worker.join()
+
+    def _schedule(self):
+        with self._lock:
+            healthy = [worker for worker in self.workers if not worker.stalled] or self.workers
+            worker = healthy[self._next % len(healthy)]
+            self._next += 1
+
+        return worker
+
+    class Worker(threading.Thread):
+        """ Device Pool Worker """
+
+        STOP = float('inf')
+
+        def __init__(self, device):
+            """ Initialize Worker """
+
+            threading.Thread.__init__(self, name="DevicePool(%s)" % device.port)
+            self.daemon = True
+            self.device = device
+            self.queue = queue.PriorityQueue()
+            self.stalled = False
+            self._sequence = itertools.count()
+
+        def submit(self, job, priority=0):
+            future = Future()
+            self.queue.put((priority, next(self._sequence), job, future))
+            return future
+
+        def stop(self):
+            self.queue.put((self.STOP, next(self._sequence), None, None))
+
+        def run(self):
+            while True:
+                priority, sequence, job, future = self.queue.get()
+                if job is None:
+                    return
+
+                try:
+                    future.set_result(job(self.device))
+                    self.stalled = False
+                except SerialTimeoutException as error:
+                    self.stalled = True
+                    future.set_exception(error)
+                except Exception as error:
+                    future.set_exception(error)
@@ -0,0 +1,395 @@
+"""
+BC246T Protocol
+
+Response framing, typed response schemas, timeout and retry policy, and the
+errors raised by the scanner. Standard library only: workers which decode
+recorded traffic need not have pyserial installed.
+
+Protocol and Documentation Copyright (c) 2008-2013 Uniden and its contributing authors.
+"""
+
+import threading
+
+
+
+class SerialTimeoutException(Exception):
+    def __init__(self):
+        Exception.__init__(self, "No response from device")
+
+
+class DeviceErrorException(Exception):
+    def __init__(self):
+        Exception.__init__(self, "Command format error / Value error")
+
+
+class CommandUnavailableException(Exception):
+    def __init__(self):
+        Exception.__init__(self, "The command is invalid at this time")
+
+
+class FramingErrorException(Exception):
+    def __init__(self):
+        Exception.__init__(self, "Framing error")
+
+
+class OverrunErrorException(Exception):
+    def __init__(self):
+        Exception.__init__(self, "Overrun error")
+
+
+class Framer(object):
+    """
+        Response Framer
+
+        Splits the bytes read from a serial-like object into CR-terminated
+        response lines. Whatever is waiting is read in one call into a reusable
+        bytearray, so several responses may arrive per read and a response may
+        span reads; each complete line is decoded to text once.
+
+    """
+
+    def __init__(self, serial):
+        """ Initialize Framer """
+
+        self.serial = serial
+        self.buffer = bytearray()
+
+    def readline(self):
+        """ Get next response line (without CR), '' on timeout """
+
+        buffer = self.buffer
+        end = buffer.find(b'\r')
+        while end < 0:
+            start = len(buffer)
+            data = self.serial.read(self.serial.in_waiting or 1)
+            if not data:
+                # a partial line stays buffered for the next read
+                return ''
+            buffer += data
+            end = buffer.find(b'\r', start)
+
+        line = buffer[:end]
+        del buffer[:end + 1]
+        return line.decode('latin-1')
+
+    def clear(self):
+        """ Drop buffered bytes """
+
+        del self.buffer[:]
+
+
+class Policy(object):
+    """
+        Timeout and Retry Policy
+
+        Per-opcode read timeouts and bounded retries for Device.command.
+
+        Timeouts
+            TIMEOUTS (and `timeouts`) fix the timeout of slow commands (ex: CLR).
+            Otherwise the timeout is `timeout`, or with adaptive=True one learned from
+            observed latency as an EWMA of response time plus 4 deviations,
+            kept between `minimum` and `maximum` and doubled after a timeout.
+
+        Retries
+            SerialTimeoutException, FramingErrorException and OverrunErrorException
+            are retried up to `retries` times after flushing the input buffer,
+            except for commands unsafe to repeat (NO_RETRY).
+
+    """
+
+    TIMEOUTS = {'CLR': 10}
+    NO_RETRY = ('CSY', 'KEY', 'POF')
+    RETRY = (SerialTimeoutException, FramingErrorException, OverrunErrorException)
+
+    ALPHA = 0.125
+    BETA = 0.25
+
+    def __init__(self, timeout=0.1, retries=0, adaptive=False, minimum=0.02, maximum=1.0, timeouts=None):
+        """ Initialize Policy """
+
+        self.base = timeout
+        self.retries = retries
+        self.adaptive = adaptive
+        self.minimum = minimum
+        self.maximum = maximum
+        self.timeouts = dict(self.TIMEOUTS, **(timeouts or {}))
+        self.latency = {}
+
+    def timeout(self, opcode):
+        """ Get read timeout of opcode """
+
+        if opcode in self.timeouts:
+            return self.timeouts[opcode]
+        if not self.adaptive or opcode not in self.latency:
+            return self.base
+
+        return self.latency[opcode][2]
+
+    def observe(self, opcode, elapsed):
+        """ Learn from the response time of opcode """
+
+        if not self.adaptive:
+            return
+
+        if opcode not in self.latency:
+            average, deviation = elapsed, elapsed / 2
+        else:
+            average, deviation, timeout = self.latency[opcode]
+            deviation = (1 - self.BETA) * deviation + self.BETA * abs(average - elapsed)
+            average = (1 - self.ALPHA) * average + self.ALPHA * elapsed
+
+        self.latency[opcode] = (average, deviation, min(max(average + 4 * deviation, self.minimum), self.maximum))
+
+    def backoff(self, opcode):
+        """ Double the learned timeout of opcode after it timed out """
+
+        if self.adaptive and opcode in self.latency:
+            average, deviation, timeout = self.latency[opcode]
+            self.latency[opcode] = (average, deviation, min(timeout * 2, self.maximum))
+
+    def retryable(self, opcode):
+        return opcode not in self.NO_RETRY
+
+
+class Schema(object):
+    """
+        Typed Response Schemas
+
+        Field names and types of each response, compiled once per opcode into
+        a decoder returning typed values in place of raw strings:
+
+            str             : Raw string
+            int             : Integer, None where the scanner returned no value
+                                (compares equal to TOGGLE, SQUELCH, ALERT_STATUS, ... constants)
+            quick_key       : Integer Quick Key or QUICK_KEY.NONE ('.')
+            bits            : Quick Key status bit-vector as int
+                                (bit N set when status character N is '1')
+            icons           : Tuple of icon states (See ICON_DISPLAY_MODE class, as int)
+
+        Decoders take the response following "[OPCODE],". Single field schemas
+        decode to the value itself, others to a dict. A _decode_[OPCODE] method
+        takes the place of the compiled decoder (ex: STS, whose display fields
+        may hold ',').
+
+    """
+
+    SCHEMAS = {
+        'MDL': (('model', 'str'),),
+        'VER': (('firmware', 'str'),),
+        'STS': (('l1_char', 'str'), ('l1_mode', 'str'), ('l2_char', 'str'), ('l2_mode', 'str'), ('icon1', 'icons'), ('icon2', 'icons'),
+                ('reserve', 'str'), ('sql', 'int'), ('mut', 'int'), ('bat', 'int'), ('wat', 'int')),
+        'GID': (('sys_type', 'str'), ('tgid', 'str'), ('id_srch_mode', 'int'), ('name1', 'str'), ('name2', 'str'), ('name3', 'str')),
+        'SCT': (('count', 'int'),),
+        'SIH': (('index', 'int'),),
+        'SIT': (('index', 'int'),),
+        'CSY': (('index', 'int'),),
+        'SIN': (('sys_type', 'str'), ('name', 'str'), ('quick_key', 'quick_key'), ('hld', 'int'), ('lout', 'int'), ('att', 'int'),
+                ('dly', 'int'), ('skp', 'int'), ('emg', 'int'), ('rev_index', 'int'), ('fwd_index', 'int'),
+                ('chn_grp_head', 'int'), ('chn_grp_tail', 'int'), ('seq_no', 'int')),
+        'QSL': (('status', 'bits'),),
+        'QGL': (('status', 'bits'),),
+        'BLT': (('backlight', 'str'),),
+        'BSV': (('battery_save', 'int'),),
+        'KBP': (('key_beep', 'int'),),
+        'OMS': (('l1_char', 'str'), ('l2_char', 'str')),
+        'PRI': (('priority_mode', 'int'),),
+    }
+
+    _decoders = {}
+    # decoded STS icon groups, which repeat from poll to poll
+    _icons = {}
+
+    @classmethod
+    def decoder(cls, opcode):
+        """ Get compiled decoder of opcode (None without a schema) """
+
+        try:
+            return cls._decoders[opcode]
+        except KeyError:
+            decoder = getattr(cls, '_decode_%s' % opcode, None)
+            if decoder is None and opcode in cls.SCHEMAS:
+                decoder = cls.compile(cls.SCHEMAS[opcode])
+            cls._decoders[opcode] = decoder
+            return decoder
+
+    @classmethod
+    def register(cls, opcode, schema):
+        """ Add or replace the schema of opcode """
+
+        cls.SCHEMAS[opcode] = schema
+        cls._decoders[opcode] = cls.compile(schema)
+
+    @classmethod
+    def status(cls, response, typed=False):
+        """
+            Decode STS by its fixed width fields
+
+            Display characters may include ',', so the first six fields are sliced
+            at their documented widths (16/16/16/16/15/17 chars) rather than split.
+            Responses not matching the widths are split on ',' instead.
+
+        """
+
+        tail = response[102:].rsplit(',', 4)
+        if len(tail) == 5 and response[16] == response[33] == response[50] == response[67] == response[83] == response[101] == ',':
+            reserve, sql, mut, bat, wat = tail
+            l1_char, l1_mode, l2_char, l2_mode = response[0:16], response[17:33], response[34:50], response[51:67]
+            icon1, icon2 = response[68:83], response[84:101]
+        else:
+            l1_char, l1_mode, l2_char, l2_mode, icon1, icon2, reserve, sql, mut, bat, wat = (response.split(',') + [''] * 11)[:11]
+
+        if typed:
+            # shared by threads: decoded tuples are kept locally, as another thread may clear the cache
+            icons = cls._icons
+            if len(icons) > 1024:
+                icons.clear()
+            state = icons.get(icon1)
+            if state is None:
+                state = icons[icon1] = tuple(int(mode) for mode in icon1)
+            icon1 = state
+            state = icons.get(icon2)
+            if state is None:
+                state = icons[icon2] = tuple(int(mode) for mode in icon2)
+            icon2 = state
+            sql = int(sql) if sql else None
+            mut = int(mut) if mut else None
+            bat = int(bat) if bat else None
+            wat = int(wat) if wat else None
+
+        return {
+            'l1_char': l1_char, 'l1_mode': l1_mode, 'l2_char': l2_char, 'l2_mode': l2_mode, 'icon1': icon1, 'icon2': icon2,
+            'reserve': reserve, 'sql': sql, 'mut': mut, 'bat': bat, 'wat': wat,
+        }
+
+    @staticmethod
+    def squelch(response):
+        """ Decode only the [SQL] field of STS, as int (for polling loops) """
+
+        return int(response.rsplit(',', 4)[1])
+
+    @classmethod
+    def _decode_STS(cls, response):
+        return cls.status(response, typed=True)
+
+    @classmethod
+    def compile(cls, schema):
+        """ Compile schema into a decoder function with conversions inlined """
+
+        converters = {
+            'str': '%(f)s',
+            'int': '(int(%(f)s) if %(f)s else None)',
+            'quick_key': "(int(%(f)s) if %(f)s and %(f)s != '.' else %(f)s)",
+            'bits': '(int(%(f)s[::-1], 2) if %(f)s else None)',
+            'icons': 'tuple(map(int, %(f)s))',
+        }
+        names = ['f%d' % i for i in range(len(schema))]
+        values = [converters[kind] % {'f': name} for name, (key, kind) in zip(names, schema)]
+        if len(schema) == 1:
+            value = values[0]
+        else:
+            value = '{%s}' % ', '.join('%r: %s' % (key, value) for (key, kind), value in zip(schema, values))
+
+        source = (
+            "def decode(response):\n"
+            "    fields = response.split(',')\n"
+            "    if len(fields) != %(count)d:\n"
+            "        fields = (fields + [''] * %(count)d)[:%(count)d]\n"
+            "    %(names)s, = fields\n"
+            "    return %(value)s\n" % {'count': len(schema), 'names': ', '.join(names), 'value': value})
+        namespace = {}
+        exec(source, namespace)
+
+        return namespace['decode']
+
+
+class TagTable(object):
+    """
+        Interned Alpha Tag Table
+
+        Maps each distinct tag (ex: GID NAME1-3, SIN NAME) to a small int id and
+        back. Tags decoded through the table share one string object, so the
+        same few hundred names repeated across responses, logs and tables cost
+        their memory once and may be stored and grouped by id.
+
+            tags = TagTable()
+            tags.id('FIRE')         # 1 ('' is always 0)
+            tags.tag(1)             # 'FIRE'
+
+    """
+
+    def __init__(self):
+        """ Initialize TagTable """
+
+        self.tags = ['']
+        self.ids = {'': 0}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __contains__(self, tag):
+        return tag in self.ids
+
+    def id(self, tag):
+        """ Get id of tag, adding it on first use """
+
+        try:
+            return self.ids[tag]
+        except KeyError:
+            with self._lock:
+                if tag not in self.ids:
+                    # ids are read without the lock: publish only once the tag is stored
+                    self.tags.append(tag)
+                    self.ids[tag] = len(self.tags) - 1
+                return self.ids[tag]
+
+    def tag(self, id):
+        """ Get tag of id """
+
+        return self.tags[id]
+
+    def intern(self, tag):
+        """ Get the table's copy of tag """
+
+        return self.tags[self.id(tag)]
+
+
+class Future(object):
+    """ Pending command response """
+
+    def __init__(self, resolve=None):
+        """ Initialize Future """
+
+        self._resolve = resolve
+        self._event = threading.Event()
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        return self._event.is_set()
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self._event.set()
+
+    def exception(self, timeout=None):
+        """ Wait for and return the raised exception (or None) """
+
+        if not self.done() and self._resolve:
+            self._resolve()
+        if not self._event.wait(timeout):
+            raise SerialTimeoutException
+
+        return self._exception
+
+    def result(self, timeout=None):
+        """ Wait for and return the response, raising its exception """
+
+        if self.exception(timeout):
+            raise self._exception
+
+        return self._result
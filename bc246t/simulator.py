@@ -0,0 +1,479 @@
+"""
+BC246T Simulator
+
+Protocol and Documentation Copyright (c) 2008-2013 Uniden and its contributing authors.
+"""
+
+import os
+import time
+import select
+import threading
+import collections
+
+from .table import SystemTable
+
+
+class Simulator(object):
+    """
+        BC246T Simulator
+
+        In-process loopback stand-in for serial.Serial which answers the BC246T
+        protocol from simulated scanner memory. May be passed to Device (or
+        anywhere else a serial.Serial is used) in place of a port name:
+
+            dev = Device(Simulator(baudrate=57600, delay=0.002))
+
+        Timing
+            Bytes take 10 bit times on the line (1 start, 8 data, 1 stop bit).
+            Commands are processed in arrival order, each taking `delay` seconds
+                (or delays[OPCODE] where given).
+            Responses are not readable before they would arrive on a real line.
+            With latency=False every command is answered instantly.
+
+        Errors
+            ERR             : Unknown command / Command format error / Value error
+            [CMD],NG        : Command invalid at this time (Program Mode mismatch)
+            FER/ORER        : Queued with inject(). ORER is also returned when more than
+                              `buffer` bytes of commands are waiting to be processed.
+
+        The scanner only answers while `baudrate` matches its PC Control
+        setting, `line_rate` (default: the initial baudrate).
+
+    """
+
+    MODEL = 'BC246T'
+    FIRMWARE = 'VR1.00'
+    CAPACITY = 200
+
+    # only acceptable in Programming Mode
+    PROGRAM_COMMANDS = ('SCT', 'SIH', 'SIT', 'CSY', 'DSY', 'SIN', 'QSL', 'QGL', 'CLR', 'BLT', 'BSV', 'KBP', 'OMS', 'PRI')
+    # invalid in Programming Mode
+    SCAN_COMMANDS = ('KEY', 'QSH')
+
+    SETTINGS = {'BLT': 'IF', 'BSV': '1', 'KBP': '1', 'PRI': '0', 'OMS': ('', '')}
+    OPENING_MESSAGE = ('     BC246T     ', '  Uniden  ')
+
+    SYS_TYPES = SystemTable.SYS_TYPES
+    SYSTEM = {'name': '', 'quick_key': '.', 'hld': '2', 'lout': '0', 'att': '0', 'dly': '2', 'skp': '0', 'emg': '0'}
+
+    def __init__(self, port=None, baudrate=57600, timeout=0.1, latency=True, delay=0.0, delays=None, buffer=64, line_rate=None):
+        """ Initialize Simulator """
+
+        self.port = port
+        self.baudrate = baudrate
+        self.line_rate = line_rate or baudrate
+        self.timeout = timeout
+        self.latency = latency
+        self.delay = delay
+        self.delays = dict(delays or {})
+        self.buffer = buffer
+
+        # observable scanner state
+        self.program = False
+        self.power = True
+        self.lines = ('', '')
+        self.squelch = 0
+        self.mute = 0
+        self.battery = 0
+        self.weather = 0
+        self.talkgroup = ('', '', '0', '', '', '')
+        # FRQ values (100 Hz units) whose squelch opens when tuned with QSH
+        self.signals = set()
+
+        self.clear()
+
+        self._input = ''
+        self._rx = ''
+        self._output = collections.deque()
+        self._backlog = collections.deque()
+        self._errors = collections.deque()
+        self._line_in = self._line_out = self._busy = 0.0
+
+    def clear(self):
+        """ Return simulated memory to default values """
+
+        self.settings = dict(self.SETTINGS)
+        self.systems = {}
+        self.order = []
+        self.system_quick_lockout = '0' * 10
+
+    def populate(self, count, sys_type='CNV'):
+        """ Create `count` systems directly in simulated memory """
+
+        program, self.program = self.program, True
+        for i in range(count):
+            index = self.process('CSY,%s' % sys_type).split(',')[1]
+            self.process('SIN,%s,SYSTEM %d' % (index, i + 1))
+        self.program = program
+
+    def pty(self):
+        """
+            Serve the simulated scanner on a pseudo-terminal
+
+            Returns the device name of the controller side (ex: /dev/pts/3), which
+            may be opened like a real scanner port. POSIX only.
+
+        """
+
+        import pty
+        import tty
+
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        self._pty = slave
+
+        thread = threading.Thread(target=self._serve, args=(master,))
+        thread.daemon = True
+        thread.start()
+
+        return os.ttyname(slave)
+
+    def _serve(self, fd):
+        """ Answer commands read from fd until it closes """
+
+        while True:
+            self._arrive(time.time())
+            if self._rx:
+                os.write(fd, self._rx.encode('latin-1'))
+                self._rx = ''
+
+            wait = max(self._output[0][0] - time.time(), 0) if self._output else None
+            if not select.select([fd], [], [], wait)[0]:
+                continue
+
+            try:
+                data = os.read(fd, 1024)
+            except OSError:
+                return
+            if not data:
+                return
+
+            self.write(data)
+
+    def inject(self, error, count=1):
+        """ Answer the next `count` commands with error ('FER', 'ORER' or None for no response) """
+
+        self._errors.extend([error] * count)
+
+    @property
+    def byte_time(self):
+        """ Seconds per byte on the line """
+
+        return 10.0 / self.baudrate if self.latency else 0.0
+
+    def write(self, data):
+        """ Receive command bytes """
+
+        if not isinstance(data, str):
+            data = bytes(data).decode('latin-1')
+        if self.latency:
+            self._line_in = max(self._line_in, time.time()) + len(data) * self.byte_time
+
+        # commands sent at another rate than the scanner's PC Control setting are not understood
+        if self.baudrate != self.line_rate:
+            return len(data)
+
+        self._input += data
+        while '\r' in self._input:
+            frame, self._input = self._input.split('\r', 1)
+            self._receive(frame, self._line_in)
+
+        return len(data)
+
+    def writelines(self, sequence):
+        for data in sequence:
+            self.write(data)
+
+    def read(self, size=1):
+        """ Read up to size bytes, waiting at most timeout seconds """
+
+        deadline = self._deadline()
+        while len(self._rx) < size and self._wait(deadline):
+            pass
+
+        data, self._rx = self._rx[:size], self._rx[size:]
+        return data.encode('latin-1')
+
+    def readline(self):
+        """ Read up to and including the next CR, waiting at most timeout seconds """
+
+        deadline = self._deadline()
+        while '\r' not in self._rx and self._wait(deadline):
+            pass
+
+        end = self._rx.find('\r') + 1 or len(self._rx)
+        data, self._rx = self._rx[:end], self._rx[end:]
+        return data.encode('latin-1')
+
+    @property
+    def in_waiting(self):
+        self._arrive(time.time())
+        return len(self._rx)
+
+    def inWaiting(self):
+        return self.in_waiting
+
+    def reset_input_buffer(self):
+        self._arrive(time.time())
+        self._rx = ''
+
+    flushInput = reset_input_buffer
+
+    def reset_output_buffer(self):
+        pass
+
+    flushOutput = reset_output_buffer
+
+    def flush(self):
+        pass
+
+    def isOpen(self):
+        return True
+
+    def close(self):
+        pass
+
+    def _deadline(self):
+        return None if self.timeout is None else time.time() + self.timeout
+
+    def _arrive(self, now):
+        """ Move responses which reached the controller into the receive buffer """
+
+        while self._output and (not self.latency or self._output[0][0] <= now):
+            self._rx += self._output.popleft()[1]
+
+    def _wait(self, deadline):
+        """ Wait for the next response to arrive, returning False once nothing more will before deadline """
+
+        now = time.time()
+        self._arrive(now)
+        if not self._output:
+            if self.latency and deadline is not None and deadline > now:
+                time.sleep(deadline - now)
+            return False
+
+        ready = self._output[0][0]
+        if deadline is not None and ready > deadline:
+            if deadline > now:
+                time.sleep(deadline - now)
+            self._arrive(deadline)
+            return False
+
+        if ready > now:
+            time.sleep(ready - now)
+        self._arrive(ready)
+        return True
+
+    def _receive(self, frame, arrived):
+        """ Queue a command frame for processing at its arrival time """
+
+        opcode = frame.split(',', 1)[0]
+
+        # commands received while earlier ones are still being processed wait in the input buffer
+        while self._backlog and self._backlog[0][0] <= arrived:
+            self._backlog.popleft()
+        if self.latency and sum(size for start, size in self._backlog) + len(frame) + 1 > self.buffer:
+            self._respond('ORER', arrived)
+            return
+
+        start = max(arrived, self._busy)
+        if start > arrived:
+            self._backlog.append((start, len(frame) + 1))
+        if self.latency:
+            self._busy = start + self.delays.get(opcode, self.delay)
+
+        error = self._errors.popleft() if self._errors else False
+        if error is not False:
+            if error:
+                self._respond(error, self._busy)
+            return
+
+        response = self.process(frame)
+        if response is not None:
+            self._respond(response, self._busy)
+
+    def _respond(self, response, done):
+        response += '\r'
+        self._line_out = max(self._line_out, done) + len(response) * self.byte_time
+        self._output.append((self._line_out, response))
+
+    def process(self, frame):
+        """ Execute a command frame against simulated memory, returning the response line """
+
+        if not self.power:
+            return None
+
+        args = frame.split(',')
+        opcode = args.pop(0)
+        handler = getattr(self, '_cmd_%s' % opcode, None)
+        if not handler:
+            return 'ERR'
+        if opcode in self.PROGRAM_COMMANDS and not self.program:
+            return '%s,NG' % opcode
+        if opcode in self.SCAN_COMMANDS and self.program:
+            return '%s,NG' % opcode
+
+        try:
+            response = handler(*args)
+        except (TypeError, ValueError, KeyError):
+            return 'ERR'
+
+        return '%s,%s' % (opcode, response)
+
+    def _system(self, index):
+        """ Look up a system by index string """
+
+        return self.systems[int(index)]
+
+    def _cmd_MDL(self):
+        return self.MODEL
+
+    def _cmd_VER(self):
+        return self.FIRMWARE
+
+    def _cmd_PRG(self):
+        self.program = True
+        return 'OK'
+
+    def _cmd_EPG(self):
+        self.program = False
+        return 'OK'
+
+    def _cmd_POF(self):
+        self.power = False
+        return 'OK'
+
+    def _cmd_STS(self):
+        l1_char, l2_char = ('Remote Mode', 'Keypad Lock') if self.program else self.lines
+        return ','.join((
+            l1_char[:16].ljust(16), ' ' * 16,
+            l2_char[:16].ljust(16), ' ' * 16,
+            '0' * 15, '0' * 17, '',
+            str(self.squelch), str(self.mute), str(self.battery), str(self.weather)))
+
+    def _cmd_GID(self):
+        return ','.join(self.talkgroup)
+
+    def _cmd_KEY(self, key_code, key_mode='P'):
+        if len(key_code) != 1 or key_code not in 'MFHSL!1234567890.E<>^P' or key_mode not in ('P', 'L', 'H', 'R'):
+            raise ValueError
+        return 'OK'
+
+    def _cmd_QSH(self, frq, *args):
+        if not frq.isdigit() or len(args) > 8:
+            raise ValueError
+        # [SCR] is an 8 digit field (the scanner aborts on any format error)
+        if len(args) > 6 and args[6] and not (len(args[6]) == 8 and args[6].isdigit()):
+            raise ValueError
+        if self.signals:
+            self.squelch = int(int(frq) in self.signals)
+        return 'OK'
+
+    def _cmd_CLR(self):
+        self.clear()
+        return 'OK'
+
+    def _setting(self, opcode, value, choices):
+        if value is None:
+            return self.settings[opcode]
+        if value not in choices:
+            raise ValueError
+        self.settings[opcode] = value
+        return 'OK'
+
+    def _cmd_BLT(self, value=None):
+        return self._setting('BLT', value, ('IF', '10', '30', 'KY', 'SQ'))
+
+    def _cmd_BSV(self, value=None):
+        return self._setting('BSV', value, ('0', '1'))
+
+    def _cmd_KBP(self, value=None):
+        return self._setting('KBP', value, ('0', '1'))
+
+    def _cmd_PRI(self, value=None):
+        return self._setting('PRI', value, ('0', '1'))
+
+    def _cmd_OMS(self, *args):
+        if not args:
+            message = self.settings['OMS']
+            return ','.join(self.OPENING_MESSAGE if not ''.join(message).strip() else message)
+        if len(args) > 2 or [arg for arg in args if len(arg) > 16]:
+            raise ValueError
+        self.settings['OMS'] = (args + ('', ''))[:2]
+        return 'OK'
+
+    def _cmd_SCT(self):
+        return str(len(self.order))
+
+    def _cmd_SIH(self):
+        return str(self.order[0] if self.order else -1)
+
+    def _cmd_SIT(self):
+        return str(self.order[-1] if self.order else -1)
+
+    def _cmd_CSY(self, sys_type):
+        if sys_type not in self.SYS_TYPES:
+            raise ValueError
+        free = [index for index in range(1, self.CAPACITY + 1) if index not in self.systems]
+        if not free:
+            return '-1'
+
+        system = dict(self.SYSTEM, sys_type=sys_type, qgl='0' * 10)
+        self.systems[free[0]] = system
+        self.order.append(free[0])
+        return str(free[0])
+
+    def _cmd_DSY(self, index):
+        del self.systems[int(index)]
+        self.order.remove(int(index))
+        return 'OK'
+
+    def _cmd_SIN(self, index, *args):
+        system = self._system(index)
+        if not args:
+            position = self.order.index(int(index))
+            rev_index = self.order[position - 1] if position else -1
+            fwd_index = self.order[position + 1] if position + 1 < len(self.order) else -1
+            return ','.join([system[key] for key in ('sys_type', 'name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg')] +
+                            [str(rev_index), str(fwd_index), '-1', '-1', str(position + 1)])
+
+        keys = ('name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg')
+        if len(args) > len(keys):
+            raise ValueError
+        values = dict((key, value) for key, value in zip(keys, args) if value != '')
+
+        # the command is aborted if any format error is detected
+        checks = {
+            'name': lambda value: len(value) <= 16,
+            'quick_key': lambda value: value == '.' or (len(value) == 1 and value.isdigit()),
+            'hld': lambda value: value.isdigit() and int(value) <= 255,
+            'lout': lambda value: value in ('0', '1'),
+            'att': lambda value: value in ('0', '1'),
+            'dly': lambda value: value in ('0', '1', '2', '3', '4', '5'),
+            'skp': lambda value: value in ('0', '1'),
+            'emg': lambda value: value in ('0', '1'),
+        }
+        for key, value in values.items():
+            if not checks[key](value):
+                raise ValueError
+
+        system.update(values)
+        return 'OK'
+
+    def _quick_lockout(self, value):
+        if len(value) != 10 or value.strip('01'):
+            raise ValueError
+        return value
+
+    def _cmd_QSL(self, value=None):
+        if value is None:
+            return self.system_quick_lockout
+        self.system_quick_lockout = self._quick_lockout(value)
+        return 'OK'
+
+    def _cmd_QGL(self, index, value=None):
+        system = self._system(index)
+        if value is None:
+            return system['qgl']
+        system['qgl'] = self._quick_lockout(value)
+        return 'OK'
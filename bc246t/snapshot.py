@@ -0,0 +1,112 @@
+"""
+BC246T Programming Snapshots
+"""
+
+import struct
+
+from .device import Device
+
+
+class Snapshot(object):
+    """
+        Scanner Programming Snapshot
+
+        Versioned binary file, streamed as it is read from the scanner:
+
+            [MAGIC][VERSION][RECORD]...[END]
+
+                [MAGIC]         : "BC246T"
+                [VERSION]       : Format Version (1 byte)
+                [RECORD]        : [TYPE] (1 byte), [LENGTH] (2 bytes, little endian), [FIELDS]
+                [FIELDS]        : Raw response values, each prefixed with its length (1 byte)
+
+            SETTINGS            : BLT,BSV,KBP,PRI,[L1_CHAR],[L2_CHAR]
+            QSL                 : System Quick Key status
+            SYSTEM              : [INDEX],[SIN fields]...,[SEQ_NO],[QGL]
+
+    """
+
+    MAGIC = b'BC246T'
+    VERSION = 1
+
+    END = 0
+    SETTINGS = 1
+    QSL = 2
+    SYSTEM = 3
+
+    SIN = Device.Systems.FIELDS
+    FIELDS = {
+        SETTINGS: ('BLT', 'BSV', 'KBP', 'PRI', 'l1_char', 'l2_char'),
+        QSL: ('qsl',),
+        SYSTEM: ('index', 'sys_type', 'name', 'quick_key', 'hld', 'lout', 'att', 'dly', 'skp', 'emg',
+                 'rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail', 'seq_no', 'qgl'),
+    }
+
+    @classmethod
+    def read(cls, device):
+        """ Read records from a device in Program Mode (raw, even from a typed Device) """
+
+        record = dict((key, device.command(key, schema=None)) for key in ('BLT', 'BSV', 'KBP', 'PRI'))
+        record.update(device.command('OMS', keys=('l1_char', 'l2_char'), schema=None))
+        yield cls.SETTINGS, record
+
+        yield cls.QSL, {'qsl': device.command('QSL', schema=None)}
+
+        for info in device.systems._raw():
+            yield cls.SYSTEM, dict(info, qgl=device.command('QGL', info['index'], schema=None))
+
+    @classmethod
+    def write(cls, f, records):
+        """ Write records to a binary file """
+
+        f.write(cls.MAGIC + struct.pack('<B', cls.VERSION))
+        for kind, record in records:
+            fields = b''
+            for key in cls.FIELDS[kind]:
+                value = record[key]
+                value = value if isinstance(value, bytes) else value.encode('latin-1')
+                fields += struct.pack('<B', len(value)) + value
+            f.write(struct.pack('<BH', kind, len(fields)) + fields)
+        f.write(struct.pack('<BH', cls.END, 0))
+
+    @classmethod
+    def load(cls, path):
+        """ Read records from a Snapshot file """
+
+        with open(path, 'rb') as f:
+            header = f.read(len(cls.MAGIC) + 1)
+            if header[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError("%s: not a snapshot" % path)
+            version, = struct.unpack('<B', header[len(cls.MAGIC):])
+            if version != cls.VERSION:
+                raise ValueError("%s: unsupported snapshot version %d" % (path, version))
+
+            while True:
+                kind, length = struct.unpack('<BH', f.read(3))
+                if kind == cls.END:
+                    return
+
+                data = f.read(length)
+                record = {}
+                offset = 0
+                for key in cls.FIELDS[kind]:
+                    size, = struct.unpack('<B', data[offset:offset + 1])
+                    value = data[offset + 1:offset + 1 + size]
+                    record[key] = value.decode('latin-1')
+                    offset += 1 + size
+                yield kind, record
+
+    @classmethod
+    def state(cls, records):
+        """ Collect records into (settings, qsl, systems) """
+
+        settings, qsl, systems = {}, None, []
+        for kind, record in records:
+            if kind == cls.SETTINGS:
+                settings = record
+            elif kind == cls.QSL:
+                qsl = record['qsl']
+            elif kind == cls.SYSTEM:
+                systems.append(record)
+
+        return settings, qsl, systems
@@ -0,0 +1,201 @@
+"""
+BC246T Frequency Sweep
+"""
+
+import array
+import time
+import struct
+import threading
+
+from .device import Device
+from .protocol import Schema
+
+
+class Sweep(object):
+    """
+        Frequency Sweep
+
+        Steps Quick Search Hold (QSH) through frequency ranges, sampling squelch
+        (STS) at each stop after `dwell` seconds, to map band occupancy:
+
+            sweep = Sweep([(150000000, 174000000)], step=12500, skip=[(162400000, 162550000)])
+            with Sweep.Writer('survey.sweep') as writer:
+                sweep.run(dev, writer)
+
+        Frequencies are in Hz (sent as FRQ in 100 Hz units), `step` is one of
+        STEPS, `skip` holds frequencies and (low, high) ranges to pass over.
+        Each stop is sampled up to `samples` times, stopping at the first open
+        squelch. With a DevicePool, parallel() splits the stops between radios.
+
+        Rows (frequency, time, squelch, radio) stream to a columnar file in
+        blocks of up to Writer.BLOCK rows:
+
+            [MAGIC][VERSION][BLOCK]...
+
+                [MAGIC]         : "BC246TSW"
+                [VERSION]       : Format Version (1 byte)
+                [BLOCK]         : [ROWS] (4 bytes, little endian), then each COLUMN's ROWS values
+
+    """
+
+    MAGIC = b'BC246TSW'
+    VERSION = 1
+
+    # step in Hz: STP (See Device.quick_search)
+    STEPS = {5000: 500, 6250: 625, 7500: 750, 10000: 1000, 12500: 1250, 15000: 1500,
+             20000: 20000, 25000: 25000, 50000: 50000, 100000: 10000}
+
+    # column: struct/array typecode
+    COLUMNS = (
+        ('frequency', 'I'),
+        ('time', 'd'),
+        ('squelch', 'B'),
+        ('radio', 'B'),
+    )
+
+    def __init__(self, ranges, step=12500, modulation=Device.MODULATION.AUTO, dwell=0.05, samples=1, skip=(), att=0):
+        """ Initialize Sweep """
+
+        if step not in self.STEPS:
+            raise ValueError("step must be one of %s Hz" % sorted(self.STEPS))
+        if samples < 1:
+            raise ValueError("samples must be at least 1")
+
+        self.ranges = list(ranges)
+        self.step = step
+        self.modulation = modulation
+        self.dwell = dwell
+        self.samples = samples
+        self.skip = list(skip)
+        self.att = att
+
+    def _skipped(self, frequency):
+        for skip in self.skip:
+            if skip == frequency or (isinstance(skip, tuple) and skip[0] <= frequency <= skip[1]):
+                return True
+        return False
+
+    @property
+    def frequencies(self):
+        """ Get sweep stops in Hz """
+
+        frequencies = []
+        for start, stop in self.ranges:
+            frequencies.extend(frequency for frequency in range(start, stop + 1, self.step) if not self._skipped(frequency))
+        return frequencies
+
+    def run(self, device, writer=None, radio=0, frequencies=None):
+        """ Sweep stops (default: all) on device, returning its columns """
+
+        columns = dict((column, array.array(typecode)) for column, typecode in self.COLUMNS)
+        stp = self.STEPS[self.step]
+        for frequency in self.frequencies if frequencies is None else frequencies:
+            device.quick_search(frequency // 100, stp, self.modulation, self.att)
+            if self.dwell:
+                time.sleep(self.dwell)
+
+            for sample in range(self.samples):
+                squelch = device.command('STS', schema=Schema.squelch)
+                if squelch:
+                    break
+
+            row = (frequency, time.time(), squelch, radio)
+            for (column, typecode), value in zip(self.COLUMNS, row):
+                columns[column].append(value)
+            if writer is not None:
+                writer.append(*row)
+
+        return columns
+
+    def parallel(self, pool, writer=None):
+        """ Split stops into a contiguous part per DevicePool radio, returning merged columns """
+
+        if not len(pool):
+            raise ValueError("pool has no radios")
+
+        frequencies = self.frequencies
+        size = -(-len(frequencies) // len(pool))
+        futures = [pool.submit(lambda device, radio=radio: self.run(device, writer, radio, frequencies[radio * size:(radio + 1) * size]), port=device)
+                   for radio, device in enumerate(pool.devices)]
+
+        columns = dict((column, array.array(typecode)) for column, typecode in self.COLUMNS)
+        for future in futures:
+            for column, values in future.result().items():
+                columns[column].extend(values)
+        return columns
+
+    @staticmethod
+    def occupancy(columns):
+        """ Get {frequency: fraction of samples with squelch open} """
+
+        counts = {}
+        for frequency, squelch in zip(columns['frequency'], columns['squelch']):
+            total, opened = counts.get(frequency, (0, 0))
+            counts[frequency] = (total + 1, opened + squelch)
+        return dict((frequency, opened / total) for frequency, (total, opened) in counts.items())
+
+    @classmethod
+    def load(cls, path):
+        """ Read every block of a sweep file into columns """
+
+        columns = dict((column, array.array(typecode)) for column, typecode in cls.COLUMNS)
+        with open(path, 'rb') as f:
+            header = f.read(len(cls.MAGIC) + 1)
+            if header[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError("%s: not a sweep" % path)
+            version, = struct.unpack('<B', header[len(cls.MAGIC):])
+            if version != cls.VERSION:
+                raise ValueError("%s: unsupported sweep version %d" % (path, version))
+
+            while True:
+                data = f.read(4)
+                if len(data) < 4:
+                    return columns
+                rows, = struct.unpack('<I', data)
+                for column, typecode in cls.COLUMNS:
+                    size = struct.calcsize('<%d%s' % (rows, typecode))
+                    columns[column].extend(struct.unpack('<%d%s' % (rows, typecode), f.read(size)))
+
+    class Writer(object):
+        """ Sweep File Writer (See Sweep class) """
+
+        BLOCK = 4096
+
+        def __init__(self, path, block=BLOCK):
+            """ Initialize Writer """
+
+            self.f = open(path, 'wb')
+            self.f.write(Sweep.MAGIC + struct.pack('<B', Sweep.VERSION))
+            self.block = block
+            self.rows = [[] for column in Sweep.COLUMNS]
+            self._lock = threading.Lock()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, type, value, traceback):
+            self.close()
+
+        def append(self, *row):
+            with self._lock:
+                for values, value in zip(self.rows, row):
+                    values.append(value)
+                if len(self.rows[0]) >= self.block:
+                    self._flush()
+
+        def _flush(self):
+            rows = len(self.rows[0])
+            if not rows:
+                return
+
+            data = struct.pack('<I', rows)
+            for (column, typecode), values in zip(Sweep.COLUMNS, self.rows):
+                data += struct.pack('<%d%s' % (rows, typecode), *values)
+            self.f.write(data)
+            self.f.flush()
+            self.rows = [[] for column in Sweep.COLUMNS]
+
+        def close(self):
+            with self._lock:
+                self._flush()
+            self.f.close()
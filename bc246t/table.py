@@ -0,0 +1,140 @@
+"""
+BC246T System Table
+"""
+
+import array
+
+from .device import Device
+
+
+class SystemTable(object):
+    """
+        Compact System Table
+
+        Columnar store of system info for large fleets: one typed array per
+        field instead of a Device.System (with instance dict and device
+        reference) per system. Rows are read through __slots__ views.
+
+            table = SystemTable()
+            table.extend(dev, source=0)
+            locked = [row.name for row in table.where(lout=Device.System.LOUT.LOCKED)]
+
+        Values decode to ints (None where the scanner returned no value for the
+        system type), sys_type to its SYS_TYPE code and quick_key to QUICK_KEY.
+        Names are stored as Device.TAGS ids.
+
+    """
+
+    SYS_TYPES = ('CNV', 'M82S', 'M82P', 'M92', 'MV2', 'MU2', 'M81S', 'M81P', 'EDN', 'EDW', 'EDS', 'LTR', 'M82C', 'M81C')
+
+    # column: array typecode
+    COLUMNS = (
+        ('source', 'H'),
+        ('index', 'i'),
+        ('sys_type', 'B'),
+        ('name', 'I'),
+        ('quick_key', 'b'),
+        ('hld', 'h'),
+        ('lout', 'b'),
+        ('att', 'b'),
+        ('dly', 'b'),
+        ('skp', 'b'),
+        ('emg', 'b'),
+        ('rev_index', 'i'),
+        ('fwd_index', 'i'),
+        ('chn_grp_head', 'i'),
+        ('chn_grp_tail', 'i'),
+        ('seq_no', 'h'),
+    )
+
+    # stored in place of a missing value, and of QUICK_KEY.NONE
+    EMPTY = -1
+    QUICK_KEY_NONE = -2
+
+    class Row(object):
+        """ System Table Row view """
+
+        __slots__ = ('table', 'row')
+
+        def __init__(self, table, row):
+            self.table = table
+            self.row = row
+
+        def __getattr__(self, name):
+            return self.table.get(name, self.row)
+
+        def __repr__(self):
+            return "<SystemTable.Row %s>" % dict((column, self.table.get(column, self.row)) for column, typecode in self.table.COLUMNS)
+
+    def __init__(self):
+        """ Initialize SystemTable """
+
+        self.columns = dict((column, array.array(typecode)) for column, typecode in self.COLUMNS)
+
+    def __len__(self):
+        return len(self.columns['index'])
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.Row(self, row)
+
+    def __getitem__(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError(row)
+
+        return self.Row(self, row % len(self))
+
+    def append(self, index, info, source=0):
+        """ Add a system from its Device.Systems.info response """
+
+        columns = self.columns
+        columns['source'].append(source)
+        columns['index'].append(int(index))
+        columns['sys_type'].append(self.SYS_TYPES.index(info['sys_type']))
+        columns['name'].append(Device.TAGS.id(info['name']))
+        columns['quick_key'].append(self.QUICK_KEY_NONE if info['quick_key'] == '.' else self._int(info['quick_key']))
+        for column in ('hld', 'lout', 'att', 'dly', 'skp', 'emg', 'rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail', 'seq_no'):
+            columns[column].append(self._int(info[column]))
+
+    def extend(self, device, source=0):
+        """ Add every system stored on a device in Program Mode """
+
+        for system in device.systems:
+            self.append(system.index, dict((key, getattr(system, key)) for key in Device.System.INFO), source)
+
+    def _int(self, value):
+        return int(value) if value not in ('', None) else self.EMPTY
+
+    def get(self, column, row):
+        """ Get decoded value """
+
+        if column not in self.columns:
+            raise AttributeError(column)
+
+        value = self.columns[column][row]
+        if column == 'sys_type':
+            return self.SYS_TYPES[value]
+        if column == 'name':
+            return Device.TAGS.tag(value)
+        if column == 'quick_key' and value == self.QUICK_KEY_NONE:
+            return Device.System.QUICK_KEY.NONE
+        if value == self.EMPTY and column not in ('rev_index', 'fwd_index', 'chn_grp_head', 'chn_grp_tail'):
+            return None
+
+        return value
+
+    def column(self, column):
+        """ Get decoded column values """
+
+        return [self.get(column, row) for row in range(len(self))]
+
+    def where(self, **criteria):
+        """ Yield rows whose decoded columns equal every given value """
+
+        columns = sorted(criteria)
+        for row in range(len(self)):
+            for column in columns:
+                if self.get(column, row) != criteria[column]:
+                    break
+            else:
+                yield self.Row(self, row)
@@ -0,0 +1,227 @@
+"""
+BC246T Serial Traces
+
+Recording and replay of the timed byte stream of a session.
+"""
+
+import time
+import struct
+import collections
+
+from .simulator import Simulator
+
+
+class Recorder(object):
+    """
+        Serial Trace Recorder
+
+        Pass-through for the serial object of a Device which records the timed
+        byte stream of a session for replay (See Replayer class):
+
+            dev.serial = Recorder(dev.serial, 'session.trace')
+
+        Binary file, written as the session runs:
+
+            [MAGIC][VERSION][BAUDRATE][START][EVENT]...
+
+                [MAGIC]         : "BC246TRC"
+                [VERSION]       : Format Version (1 byte)
+                [BAUDRATE]      : Line speed (4 bytes, little endian)
+                [START]         : Session start, seconds since the epoch (8 byte double)
+                [EVENT]         : [TYPE] (1 byte), [DELTA] (4 bytes), [LENGTH] (2 bytes), [DATA]
+                [DELTA]         : Microseconds since the previous event (or START)
+
+            WRITE               : Bytes sent to the scanner
+            READ                : Bytes returned by read()/readline(), empty on a timeout
+            FLUSH               : Input dropped (flushInput, ex: before a Device retry), no data
+
+    """
+
+    MAGIC = b'BC246TRC'
+    VERSION = 1
+    HEADER = '<BId'
+    EVENT = '<BIH'
+
+    WRITE = 1
+    READ = 2
+    FLUSH = 3
+
+    def __init__(self, serial, path):
+        """ Initialize Recorder """
+
+        start = time.time()
+        f = open(path, 'wb')
+        f.write(self.MAGIC + struct.pack(self.HEADER, self.VERSION, int(serial.baudrate), start))
+        self.__dict__.update(serial=serial, path=path, f=f, _last=start)
+
+    def __getattr__(self, name):
+        return getattr(self.serial, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.serial, name, value)
+
+    def _event(self, kind, data):
+        now = time.time()
+        delta = min(max(int(round((now - self._last) * 1e6)), 0), 0xFFFFFFFF)
+        self.__dict__['_last'] = now
+        data = data if isinstance(data, bytes) else data.encode('latin-1')
+        self.f.write(struct.pack(self.EVENT, kind, delta, len(data)) + data)
+
+    def write(self, data):
+        self._event(self.WRITE, data)
+        return self.serial.write(data)
+
+    def writelines(self, sequence):
+        return self.write(b''.join(sequence))
+
+    def read(self, size=1):
+        data = self.serial.read(size)
+        self._event(self.READ, data)
+        return data
+
+    def readline(self):
+        data = self.serial.readline()
+        self._event(self.READ, data)
+        return data
+
+    def flushInput(self):
+        self._event(self.FLUSH, b'')
+        return self.serial.flushInput()
+
+    def reset_input_buffer(self):
+        self._event(self.FLUSH, b'')
+        return self.serial.reset_input_buffer()
+
+    def close(self):
+        """ Close trace file and serial """
+
+        self.f.close()
+        self.serial.close()
+
+    @classmethod
+    def load(cls, path):
+        """ Read (baudrate, [(type, time, data), ...]) from a trace file """
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if data[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("%s: not a trace" % path)
+        offset = len(cls.MAGIC)
+        version, baudrate, now = struct.unpack_from(cls.HEADER, data, offset)
+        if version != cls.VERSION:
+            raise ValueError("%s: unsupported trace version %d" % (path, version))
+        offset += struct.calcsize(cls.HEADER)
+
+        events = []
+        size = struct.calcsize(cls.EVENT)
+        # a trace cut short (ex: by a crash) ends at its last complete event
+        while offset + size <= len(data):
+            kind, delta, length = struct.unpack_from(cls.EVENT, data, offset)
+            offset += size
+            if offset + length > len(data):
+                break
+            now += delta / 1e6
+            events.append((kind, now, data[offset:offset + length]))
+            offset += length
+
+        return baudrate, events
+
+
+class Replayer(Simulator):
+    """
+        Serial Trace Replayer
+
+        Stand-in for serial.Serial which answers each command frame with the
+        response recorded for it (See Recorder class), after the recorded
+        latency divided by `speed` (0: instantly). Frames sent more often than
+        recorded get their last response again; frames never recorded get no
+        response (or raise ValueError with strict=True).
+
+            dev = Device(Replayer('session.trace', speed=10))
+
+        NOTE: Responses are paired with frames by opcode as they are read. Empty
+              reads are ignored, so traces of a polling SharedDevice replay too. A
+              late response counts as its frame's, after the recorded latency, so
+              a command timeout is only reproduced at speed=1.
+
+    """
+
+    ERRORS = ('ERR', 'FER', 'ORER')
+
+    def __init__(self, path, speed=1.0, strict=False, timeout=0.1):
+        """ Initialize Replayer """
+
+        baudrate, events = Recorder.load(path)
+        Simulator.__init__(self, port=path, baudrate=baudrate, timeout=timeout, latency=bool(speed))
+        self.speed = speed
+        self.strict = strict
+        self.responses = self.pair(events)
+        self._last = {}
+
+    @classmethod
+    def pair(cls, events):
+        """ Match recorded response lines to command frames, as {frame: deque([(latency, line or None)])} """
+
+        responses = {}
+        pending = collections.deque()
+        written = received = b''
+        for kind, at, data in events:
+            if kind == Recorder.WRITE:
+                written += data
+                while b'\r' in written:
+                    frame, written = written.split(b'\r', 1)
+                    pending.append((at, frame.decode('latin-1')))
+                continue
+
+            if kind == Recorder.FLUSH:
+                # responses to what was sent before are dropped unread (ex: on a retry)
+                for sent, frame in pending:
+                    responses.setdefault(frame, collections.deque()).append((None, None))
+                pending.clear()
+                received = b''
+                continue
+
+            # an empty read is a read timeout, not a command's (ex: SharedDevice polling)
+
+            received += data
+            while b'\r' in received:
+                line, received = received.split(b'\r', 1)
+                line = line.decode('latin-1')
+                opcode = line.split(',', 1)[0]
+                # commands before the one answered got no response
+                while pending:
+                    sent, frame = pending.popleft()
+                    if line in cls.ERRORS or frame.split(',', 1)[0] == opcode:
+                        responses.setdefault(frame, collections.deque()).append((at - sent, line))
+                        break
+                    responses.setdefault(frame, collections.deque()).append((None, None))
+
+        for sent, frame in pending:
+            responses.setdefault(frame, collections.deque()).append((None, None))
+
+        return responses
+
+    def _deadline(self):
+        if self.timeout is None:
+            return None
+        return time.time() + (self.timeout / self.speed if self.speed else 0)
+
+    def _receive(self, frame, arrived):
+        """ Queue the recorded response to a command frame """
+
+        recorded = self.responses.get(frame)
+        if recorded:
+            self._last[frame] = latency, line = recorded.popleft()
+        elif frame in self._last:
+            latency, line = self._last[frame]
+        elif self.strict:
+            raise ValueError("%s: %r not in trace" % (self.port, frame))
+        else:
+            return
+
+        if line is not None:
+            ready = time.time() + (latency / self.speed if self.speed else 0)
+            if self._output:
+                ready = max(ready, self._output[-1][0])
+            self._output.append((ready, line + '\r'))
@@ -0,0 +1,14 @@
+"""
+BC246T Serial Transport
+
+Opens scanner ports with pyserial, the only third-party dependency, which is
+imported here rather than by the protocol core.
+"""
+
+import serial
+
+
+def open(port, baudrate=57600, timeout=0.1):
+    """ Open port as a serial.Serial """
+
+    return serial.Serial(port=port, baudrate=baudrate, timeout=timeout)